@@ -14,3 +14,8 @@ class UserWithRoleSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'role_hint', 'is_staff']
 
+# Cached UserWithRoleSerializer payload for /auth/me/ (invalidated in accounts.signals)
+USER_ROLE_CACHE_TIMEOUT = 60
+
+def user_role_cache_key(user_id):
+    return f"user:role:{user_id}"
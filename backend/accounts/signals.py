@@ -1,7 +1,9 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
+from django.core.cache import cache
 from .models import UserProfile
+from .serializers import user_role_cache_key
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -13,3 +15,8 @@ def save_user_profile(sender, instance, **kwargs):
     if hasattr(instance, 'profile'):
         instance.profile.save()
 
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_save, sender=UserProfile)
+def invalidate_user_role_cache(sender, instance, **kwargs):
+    user_id = instance.user_id if isinstance(instance, UserProfile) else instance.pk
+    cache.delete(user_role_cache_key(user_id))
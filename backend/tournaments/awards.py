@@ -2,10 +2,36 @@
 Awards calculation module for tournaments.
 Calculates Top Scorer, MVP, Tournament Winner, Runner-up, and Third Place.
 """
-from django.db.models import Count, Q, F
+from collections import Counter
+from django.db.models import Count, F
 from .models import Tournament, Match, MatchScorer, MatchAssist, Player, Team, TeamPlayer
 
 
+# Awards are recomputed from scratch on each request, so the awards view caches the payload
+# briefly; every view that writes matches, results, teams, rosters or registrations drops the entry
+AWARDS_CACHE_TIMEOUT = 60
+
+
+def awards_cache_key(tournament_id):
+    return f"tournament:awards:{tournament_id}"
+
+
+def get_tournament_team_ids(tournament):
+    """
+    Get IDs of teams registered (pending or paid) in tournament.
+    Materialized once and memoized on the tournament instance, so repeated
+    lookups within a request don't re-run the registration subquery.
+    """
+    team_ids = getattr(tournament, '_team_ids_cache', None)
+    if team_ids is None:
+        team_ids = list(Team.objects.filter(
+            registrations__tournament=tournament,
+            registrations__status__in=['pending', 'paid']
+        ).values_list('id', flat=True))
+        tournament._team_ids_cache = team_ids
+    return team_ids
+
+
 def get_top_scorer(tournament):
     """
     Get player with most goals in tournament.
@@ -31,10 +57,7 @@ def get_top_scorer(tournament):
     
     # Get player's team in this tournament
     # Teams are related to tournaments through Registration
-    team_ids = Team.objects.filter(
-        registrations__tournament=tournament,
-        registrations__status__in=['pending', 'paid']
-    ).values_list('id', flat=True)
+    team_ids = get_tournament_team_ids(tournament)
     
     team_player = TeamPlayer.objects.filter(
         player_id=player_id,
@@ -72,10 +95,7 @@ def get_mvp(tournament):
         try:
             player = Player.objects.get(id=selected_mvp_id)
             # Verify player is in this tournament
-            team_ids = Team.objects.filter(
-                registrations__tournament=tournament,
-                registrations__status__in=['pending', 'paid']
-            ).values_list('id', flat=True)
+            team_ids = get_tournament_team_ids(tournament)
             
             team_player = TeamPlayer.objects.filter(
                 player_id=selected_mvp_id,
@@ -158,10 +178,7 @@ def get_mvp(tournament):
     
     # Get player's team in this tournament
     # Teams are related to tournaments through Registration
-    team_ids = Team.objects.filter(
-        registrations__tournament=tournament,
-        registrations__status__in=['pending', 'paid']
-    ).values_list('id', flat=True)
+    team_ids = get_tournament_team_ids(tournament)
     
     team_player = TeamPlayer.objects.filter(
         player_id=top_mvp['player_id'],
@@ -185,6 +202,45 @@ def get_mvp(tournament):
     }
 
 
+def _league_standings(tournament):
+    """
+    League table for the tournament's registered teams, best first.
+    Finished matches are tallied in one pass keyed by team id, rather than
+    querying each team's matches and loading both teams to compare them.
+    """
+    teams = list(Team.objects.filter(registrations__tournament=tournament, registrations__status__in=['pending', 'paid']).distinct())
+    totals = {team.id: {'points': 0, 'goals_for': 0, 'goals_against': 0} for team in teams}
+    
+    score_lines = Match.objects.filter(tournament=tournament, status='finished').values_list(
+        'home_team_id', 'away_team_id', 'home_score', 'away_score'
+    )
+    for home_id, away_id, home_score, away_score in score_lines:
+        for team_id, scored, conceded in ((home_id, home_score, away_score), (away_id, away_score, home_score)):
+            team_totals = totals.get(team_id)
+            if team_totals is None:
+                continue
+            team_totals['goals_for'] += scored or 0
+            team_totals['goals_against'] += conceded or 0
+            if scored > conceded:
+                team_totals['points'] += 3
+            elif scored == conceded:
+                team_totals['points'] += 1
+    
+    standings = [
+        {
+            'team': team,
+            'points': totals[team.id]['points'],
+            'goal_difference': totals[team.id]['goals_for'] - totals[team.id]['goals_against'],
+            'goals_for': totals[team.id]['goals_for']
+        }
+        for team in teams
+    ]
+    
+    # Sort by points, goal difference, goals for
+    standings.sort(key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), reverse=True)
+    return standings
+
+
 def get_tournament_winner(tournament):
     """
     Get tournament winner team.
@@ -193,56 +249,7 @@ def get_tournament_winner(tournament):
     - For combination: Winner of knockout stage final
     """
     if tournament.format == 'league':
-        # Calculate standings manually (same logic as views.py)
-        teams = list(Team.objects.filter(registrations__tournament=tournament, registrations__status__in=['pending', 'paid']).distinct())
-        matches = Match.objects.filter(tournament=tournament, status='finished')
-        
-        standings = []
-        for team in teams:
-            team_matches = matches.filter(
-                Q(home_team=team) | Q(away_team=team)
-            )
-            
-            points = 0
-            wins = 0
-            draws = 0
-            losses = 0
-            goals_for = 0
-            goals_against = 0
-            
-            for match in team_matches:
-                if match.home_team == team:
-                    goals_for += match.home_score or 0
-                    goals_against += match.away_score or 0
-                    if match.home_score > match.away_score:
-                        wins += 1
-                        points += 3
-                    elif match.home_score == match.away_score:
-                        draws += 1
-                        points += 1
-                    else:
-                        losses += 1
-                else:
-                    goals_for += match.away_score or 0
-                    goals_against += match.home_score or 0
-                    if match.away_score > match.home_score:
-                        wins += 1
-                        points += 3
-                    elif match.away_score == match.home_score:
-                        draws += 1
-                        points += 1
-                    else:
-                        losses += 1
-            
-            standings.append({
-                'team': team,
-                'points': points,
-                'goal_difference': goals_for - goals_against,
-                'goals_for': goals_for
-            })
-        
-        # Sort by points, goal difference, goals for
-        standings.sort(key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), reverse=True)
+        standings = _league_standings(tournament)
         
         if standings and len(standings) > 0:
             winner_team = standings[0].get('team')
@@ -351,56 +358,7 @@ def get_tournament_runner_up(tournament):
     Get runner-up team (2nd place).
     """
     if tournament.format == 'league':
-        # Calculate standings manually (same logic as views.py)
-        teams = list(Team.objects.filter(registrations__tournament=tournament, registrations__status__in=['pending', 'paid']).distinct())
-        matches = Match.objects.filter(tournament=tournament, status='finished')
-        
-        standings = []
-        for team in teams:
-            team_matches = matches.filter(
-                Q(home_team=team) | Q(away_team=team)
-            )
-            
-            points = 0
-            wins = 0
-            draws = 0
-            losses = 0
-            goals_for = 0
-            goals_against = 0
-            
-            for match in team_matches:
-                if match.home_team == team:
-                    goals_for += match.home_score or 0
-                    goals_against += match.away_score or 0
-                    if match.home_score > match.away_score:
-                        wins += 1
-                        points += 3
-                    elif match.home_score == match.away_score:
-                        draws += 1
-                        points += 1
-                    else:
-                        losses += 1
-                else:
-                    goals_for += match.away_score or 0
-                    goals_against += match.home_score or 0
-                    if match.away_score > match.home_score:
-                        wins += 1
-                        points += 3
-                    elif match.away_score == match.home_score:
-                        draws += 1
-                        points += 1
-                    else:
-                        losses += 1
-            
-            standings.append({
-                'team': team,
-                'points': points,
-                'goal_difference': goals_for - goals_against,
-                'goals_for': goals_for
-            })
-        
-        # Sort by points, goal difference, goals for
-        standings.sort(key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), reverse=True)
+        standings = _league_standings(tournament)
         
         if standings and len(standings) > 1:
             runner_up_team = standings[1].get('team')
@@ -508,56 +466,7 @@ def get_tournament_third_place(tournament):
     For combination: 3rd place in standings if league stage, or third place match if knockout
     """
     if tournament.format == 'league':
-        # Calculate standings manually (same logic as views.py)
-        teams = list(Team.objects.filter(registrations__tournament=tournament, registrations__status__in=['pending', 'paid']).distinct())
-        matches = Match.objects.filter(tournament=tournament, status='finished')
-        
-        standings = []
-        for team in teams:
-            team_matches = matches.filter(
-                Q(home_team=team) | Q(away_team=team)
-            )
-            
-            points = 0
-            wins = 0
-            draws = 0
-            losses = 0
-            goals_for = 0
-            goals_against = 0
-            
-            for match in team_matches:
-                if match.home_team == team:
-                    goals_for += match.home_score or 0
-                    goals_against += match.away_score or 0
-                    if match.home_score > match.away_score:
-                        wins += 1
-                        points += 3
-                    elif match.home_score == match.away_score:
-                        draws += 1
-                        points += 1
-                    else:
-                        losses += 1
-                else:
-                    goals_for += match.away_score or 0
-                    goals_against += match.home_score or 0
-                    if match.away_score > match.home_score:
-                        wins += 1
-                        points += 3
-                    elif match.away_score == match.home_score:
-                        draws += 1
-                        points += 1
-                    else:
-                        losses += 1
-            
-            standings.append({
-                'team': team,
-                'points': points,
-                'goal_difference': goals_for - goals_against,
-                'goals_for': goals_for
-            })
-        
-        # Sort by points, goal difference, goals for
-        standings.sort(key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), reverse=True)
+        standings = _league_standings(tournament)
         
         if standings and len(standings) > 2:
             third_place_team = standings[2].get('team')
@@ -620,28 +529,22 @@ def get_clean_sheets_leader(tournament):
         registrations__status__in=['pending', 'paid']
     ).distinct()
     
-    # Get all finished matches for this tournament
-    matches = Match.objects.filter(tournament=tournament, status='finished')
+    # Count clean sheets (conceded 0 goals) per team id in one pass over the finished matches
+    clean_sheet_counts = Counter()
+    score_lines = Match.objects.filter(tournament=tournament, status='finished').values_list(
+        'home_team_id', 'away_team_id', 'home_score', 'away_score'
+    )
+    for home_id, away_id, home_score, away_score in score_lines:
+        if away_score == 0:
+            clean_sheet_counts[home_id] += 1
+        if home_score == 0:
+            clean_sheet_counts[away_id] += 1
     
     # Calculate clean sheets per team
     team_clean_sheets = {}
     
     for team in teams:
-        clean_sheets = 0
-        # Get all matches where this team played
-        team_matches = matches.filter(
-            Q(home_team=team) | Q(away_team=team)
-        )
-        
-        for match in team_matches:
-            # Check if team kept a clean sheet (conceded 0 goals)
-            if match.home_team == team:
-                if match.away_score == 0:
-                    clean_sheets += 1
-            else:  # away_team == team
-                if match.home_score == 0:
-                    clean_sheets += 1
-        
+        clean_sheets = clean_sheet_counts[team.id]
         if clean_sheets > 0:
             team_clean_sheets[team.id] = {
                 'team': team,
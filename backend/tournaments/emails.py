@@ -1,12 +1,17 @@
 # tournaments/emails.py
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from django.core.mail import send_mail
+from django.db import transaction
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
 logger = logging.getLogger(__name__)
 
+# Small worker pool so SMTP round trips happen outside the request/response cycle
+_email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tournament-email')
+
 
 def send_registration_confirmation(registration):
     """Send registration confirmation email to manager"""
@@ -87,6 +92,15 @@ Tournament Management Team
         logger.warning(f"Failed to send payment confirmation email: {e}")
         return False
 
+def queue_payment_confirmation(registration):
+    """Send the payment confirmation email on a background thread once the current transaction commits"""
+    # Resolve related objects now so the worker thread never needs a DB connection
+    registration.team
+    registration.tournament
+    # A rolled-back payment must not be confirmed. Delivery stays best-effort: the in-process
+    # pool has no retry and loses queued mail on restart, failures are only logged
+    transaction.on_commit(lambda: _email_executor.submit(send_payment_confirmation, registration))
+
 def send_new_registration_notification(registration, organizer_email):
     """Send notification to organizer when a new team registers"""
     team = registration.team
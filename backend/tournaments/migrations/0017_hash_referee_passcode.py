@@ -0,0 +1,30 @@
+# Generated manually to store referee passcodes as password hashes
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import migrations, models
+
+
+def hash_existing_passcodes(apps, schema_editor):
+    Referee = apps.get_model('tournaments', 'Referee')
+    for referee in Referee.objects.all():
+        try:
+            identify_hasher(referee.passcode)
+        except ValueError:
+            referee.passcode = make_password(referee.passcode)
+            referee.save(update_fields=['passcode'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0016_add_team_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='referee',
+            name='passcode',
+            field=models.CharField(max_length=128),
+        ),
+        migrations.RunPython(hash_existing_passcodes, migrations.RunPython.noop),
+    ]
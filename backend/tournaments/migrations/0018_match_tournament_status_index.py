@@ -0,0 +1,17 @@
+# Generated manually to index Match lookups by (tournament, status)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0017_hash_referee_passcode'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'status'], name='match_tournament_status_idx'),
+        ),
+    ]
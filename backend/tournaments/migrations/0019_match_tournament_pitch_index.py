@@ -0,0 +1,17 @@
+# Generated manually to index Match lookups by (tournament, pitch)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0018_match_tournament_status_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'pitch'], name='match_tournament_pitch_idx'),
+        ),
+    ]
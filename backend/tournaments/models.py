@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
 from datetime import datetime
 
 class Venue(models.Model):
@@ -173,7 +174,7 @@ class Referee(models.Model):
     """Referee model for managing match officials"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True, related_name='referee_profile')
     username = models.CharField(max_length=100, unique=True)
-    passcode = models.CharField(max_length=50)  # Simple passcode (can be hashed later)
+    passcode = models.CharField(max_length=128)  # Stored hashed (see save/check_passcode)
     name = models.CharField(max_length=200)
     email = models.EmailField(blank=True)
     phone = models.CharField(max_length=40, blank=True)
@@ -182,6 +183,18 @@ class Referee(models.Model):
     
     def __str__(self):
         return f"{self.name} ({self.username})"
+    
+    def save(self, *args, **kwargs):
+        """Hash the passcode if it was assigned in plain text"""
+        if self.passcode:
+            try:
+                identify_hasher(self.passcode)
+            except ValueError:
+                self.passcode = make_password(self.passcode)
+        super().save(*args, **kwargs)
+    
+    def check_passcode(self, raw_passcode):
+        return check_password(raw_passcode, self.passcode)
 
 class Match(models.Model):
     STATUS_CHOICES=[("scheduled","Scheduled"),("live","Live"),("finished","Finished")]
@@ -199,6 +212,12 @@ class Match(models.Model):
     started_at = models.DateTimeField(null=True, blank=True, help_text="When match was started (set to live)")
     duration_minutes = models.PositiveIntegerField(null=True, blank=True, help_text="Match duration in minutes")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["tournament", "status"], name="match_tournament_status_idx"),
+            models.Index(fields=["tournament", "pitch"], name="match_tournament_pitch_idx"),
+        ]
+
 class MatchReferee(models.Model):
     """Link referees to matches for assignment"""
     match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='assigned_referees')
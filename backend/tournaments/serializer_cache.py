@@ -0,0 +1,18 @@
+# tournaments/serializer_cache.py
+import copy
+
+
+# Field templates built by ModelSerializer.get_fields(), keyed on serializer class
+_fields_cache = {}
+
+
+class CachedFieldsMixin:
+    """Build a ModelSerializer's fields from the model once per class, then hand out fresh copies"""
+
+    def get_fields(self):
+        cls = self.__class__
+        if cls not in _fields_cache:
+            _fields_cache[cls] = super().get_fields()
+        # Fields are bound to their parent serializer, so every instance needs its own
+        # copies; deepcopy re-instantiates each from its init args, as DRF does for declared fields
+        return copy.deepcopy(_fields_cache[cls])
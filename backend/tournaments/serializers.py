@@ -4,7 +4,8 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.db import transaction, IntegrityError
 from django.utils import timezone
-from .models import Venue, Tournament, Team, Registration, Match, Player, TeamPlayer, MatchScorer, MatchAssist
+from .models import Venue, Tournament, Team, Registration, Match, Player, TeamPlayer, MatchAssist
+from .serializer_cache import CachedFieldsMixin
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,19 @@ class VenueSerializer(serializers.ModelSerializer):
         model = Venue
         fields = "__all__"
 
+# NEW: Lightweight serializer for dashboard cards (organizer's "mine" list)
+class TournamentListSerializer(serializers.ModelSerializer):
+    venue = VenueSerializer(read_only=True)
+
+    class Meta:
+        model = Tournament
+        fields = [
+            'id', 'name', 'slug', 'tagline', 'city', 'status', 'format',
+            'start_date', 'end_date', 'entry_fee', 'team_max',
+            'hero_image', 'banner_image', 'venue', 'published',
+        ]
+        read_only_fields = fields
+
 class TournamentSerializer(serializers.ModelSerializer):
     venue = VenueSerializer(read_only=True)
     venue_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
@@ -119,7 +133,7 @@ class TournamentSerializer(serializers.ModelSerializer):
             
         return super().update(instance, validated_data)
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     members = serializers.SerializerMethodField()
     points = serializers.IntegerField(read_only=True)
     manager = UserSerializer(read_only=True, source='manager_user')
@@ -130,7 +144,11 @@ class TeamSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
     def get_members(self, obj):
-        qs = obj.memberships.select_related("player").all()
+        # Reuse memberships prefetched by the view; otherwise fetch them with their players
+        if 'memberships' in getattr(obj, '_prefetched_objects_cache', {}):
+            qs = obj.memberships.all()
+        else:
+            qs = obj.memberships.select_related("player").all()
         return TeamPlayerSerializer(qs, many=True).data
     
     def create(self, validated_data):
@@ -143,12 +161,12 @@ class TeamSerializer(serializers.ModelSerializer):
             validated_data['manager_user_id'] = request.user.id
         return super().create(validated_data)
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Player
         fields = "__all__"
 
-class TeamPlayerSerializer(serializers.ModelSerializer):
+class TeamPlayerSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     player = PlayerSerializer(read_only=True)
     player_id = serializers.PrimaryKeyRelatedField(queryset=Player.objects.all(), write_only=True, source='player')
 
@@ -165,7 +183,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         model = Registration
         fields = "__all__"
 
-class MatchSerializer(serializers.ModelSerializer):
+class MatchSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     # Nest team serializers to include full team details
     home_team = TeamSerializer(read_only=True)
     away_team = TeamSerializer(read_only=True)
@@ -179,16 +197,25 @@ class MatchSerializer(serializers.ModelSerializer):
         fields = '__all__'
         fields = "__all__"
     
+    def _match_team(self, obj, team_id, related):
+        """Resolve a goal/assist team from the match's already-loaded home/away team"""
+        if team_id == obj.home_team_id:
+            return obj.home_team
+        if team_id == obj.away_team_id:
+            return obj.away_team
+        return related()
+    
     def get_scorers(self, obj):
         """Get all scorers for this match with their assists"""
         scorers_data = []
         for scorer in obj.scorers.all():
+            team = self._match_team(obj, scorer.team_id, lambda: scorer.team)
             scorer_info = {
                 'id': scorer.id,
-                'player_id': scorer.player.id,
+                'player_id': scorer.player_id,
                 'player_name': f"{scorer.player.first_name} {scorer.player.last_name}".strip(),
-                'team_id': scorer.team.id,
-                'team_name': scorer.team.name,
+                'team_id': scorer.team_id,
+                'team_name': team.name,
                 'minute': scorer.minute,
             }
             # Check if this goal has an assist
@@ -196,7 +223,7 @@ class MatchSerializer(serializers.ModelSerializer):
                 assist = scorer.assist
                 if assist and assist.player:
                     scorer_info['assist'] = {
-                        'player_id': assist.player.id,
+                        'player_id': assist.player_id,
                         'player_name': f"{assist.player.first_name} {assist.player.last_name}".strip(),
                     }
             except MatchAssist.DoesNotExist:
@@ -212,21 +239,33 @@ class MatchSerializer(serializers.ModelSerializer):
         assists_data = []
         for assist in obj.assists.all():
             if assist.player:  # Only include assists with a player
-                try:
-                    goal_id = assist.goal.id if assist.goal else None
-                except (AttributeError, MatchScorer.DoesNotExist):
-                    goal_id = None
+                # goal_id is the FK column itself, so no MatchScorer row needs loading
+                goal_id = assist.goal_id
+                team = self._match_team(obj, assist.team_id, lambda: assist.team)
                 
                 assists_data.append({
                     'id': assist.id,
-                    'player_id': assist.player.id if assist.player else None,
-                    'player_name': f"{assist.player.first_name} {assist.player.last_name}".strip() if assist.player else 'Unknown',
-                    'team_id': assist.team.id if assist.team else None,
-                    'team_name': assist.team.name if assist.team else 'Unknown',
+                    'player_id': assist.player_id,
+                    'player_name': f"{assist.player.first_name} {assist.player.last_name}".strip(),
+                    'team_id': assist.team_id,
+                    'team_name': team.name,
                     'goal_id': goal_id,
                 })
         return assists_data
 
+class SetScoreSerializer(serializers.Serializer):
+    """Validate a result submitted to the match score endpoint"""
+    home_score = serializers.IntegerField(default=0)
+    away_score = serializers.IntegerField(default=0)
+    # Penalty scores (knockout draws only)
+    home_penalties = serializers.IntegerField(allow_null=True, default=None)
+    away_penalties = serializers.IntegerField(allow_null=True, default=None)
+    # One scorer ID per goal, and one assister ID (or null) per goal
+    home_scorers = serializers.ListField(child=serializers.IntegerField(), default=list)
+    away_scorers = serializers.ListField(child=serializers.IntegerField(), default=list)
+    home_assists = serializers.ListField(child=serializers.IntegerField(allow_null=True), default=list)
+    away_assists = serializers.ListField(child=serializers.IntegerField(allow_null=True), default=list)
+
 class TeamInlineSerializer(serializers.Serializer):
     """Serializer for team data when creating a registration"""
     name = serializers.CharField(max_length=160)
@@ -3,11 +3,13 @@ Helper functions for simulating tournament matches round by round
 """
 import logging
 
-from django.db import transaction
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connections, transaction
+from django.db.models import Count, Q
 from django.db.utils import OperationalError
 from django.utils import timezone
 from datetime import timedelta
-from tournaments.models import Match, Player, TeamPlayer, MatchScorer, MatchAssist, Team
+from tournaments.models import Match, Player, TeamPlayer, MatchScorer, MatchAssist, Team, Tournament
 from collections import Counter
 import random
 import re
@@ -16,6 +18,15 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Pitch labels look like "Group A - Round 1"; compiled once since they're parsed per match
+ROUND_RE = re.compile(r'Round\s+(\d+)', re.IGNORECASE)
+GROUP_RE = re.compile(r'Group\s+[A-Z]', re.IGNORECASE)
+
+# Single worker so bracket generation runs off the request thread, one round at a time
+_bracket_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tournament-bracket')
+# Attempts per bracket task before a transient DB error is logged and given up on
+BRACKET_TASK_ATTEMPTS = 3
+
 
 def get_next_round_matches(tournament):
     """
@@ -55,7 +66,7 @@ def get_next_round_matches(tournament):
             round_num = None
             if match.pitch:
                 # Try to extract round number from pitch field
-                match_obj = re.search(r'Round\s+(\d+)', match.pitch, re.IGNORECASE)
+                match_obj = ROUND_RE.search(match.pitch)
                 if match_obj:
                     round_num = int(match_obj.group(1))
                 else:
@@ -114,7 +125,7 @@ def get_next_round_matches(tournament):
         # Count finished matches per round
         for match in finished_matches:
             if match.pitch:
-                match_obj = re.search(r'Round\s+(\d+)', match.pitch, re.IGNORECASE)
+                match_obj = ROUND_RE.search(match.pitch)
                 if match_obj:
                     round_num = int(match_obj.group(1))
                     if round_num not in round_totals:
@@ -158,7 +169,7 @@ def get_next_round_matches(tournament):
         matches_without_round = []
         for match in round_matches:
             if match.pitch:
-                match_obj = re.search(r'Round\s+(\d+)', match.pitch, re.IGNORECASE)
+                match_obj = ROUND_RE.search(match.pitch)
                 if match_obj:
                     match_round = int(match_obj.group(1))
                     if match_round == earliest_round:
@@ -231,7 +242,7 @@ def get_next_round_matches(tournament):
             for match in round_matches:
                 if match.pitch:
                     # Extract group name (e.g., "Group A - Round 1" -> "Group A")
-                    group_match = re.search(r'Group\s+[A-Z]', match.pitch, re.IGNORECASE)
+                    group_match = GROUP_RE.search(match.pitch)
                     if group_match:
                         group_name = group_match.group(0)
                         if group_name not in matches_by_group:
@@ -250,7 +261,7 @@ def get_next_round_matches(tournament):
                 logger.debug(f"  This suggests some matches don't have group names in their pitch field.")
                 matches_without_group = []
                 for match in round_matches:
-                    if not match.pitch or not re.search(r'Group\s+[A-Z]', match.pitch, re.IGNORECASE):
+                    if not match.pitch or not GROUP_RE.search(match.pitch):
                         matches_without_group.append(match)
                 if matches_without_group:
                     logger.debug(f"    Found {len(matches_without_group)} matches without group names:")
@@ -350,7 +361,7 @@ def simulate_round(tournament):
         first_match_round = None
         for match in round_matches:
             if match.pitch:
-                match_obj = re.search(r'Round\s+(\d+)', match.pitch, re.IGNORECASE)
+                match_obj = ROUND_RE.search(match.pitch)
                 if match_obj:
                     match_round = int(match_obj.group(1))
                     if first_match_round is None:
@@ -359,8 +370,8 @@ def simulate_round(tournament):
                         # Found matches from different rounds - filter to only first round
                         logger.debug(f"  Warning: Found matches from different rounds! Filtering to Round {first_match_round} only.")
                         round_matches = [m for m in round_matches if 
-                                       m.pitch and re.search(r'Round\s+(\d+)', m.pitch, re.IGNORECASE) and 
-                                       int(re.search(r'Round\s+(\d+)', m.pitch, re.IGNORECASE).group(1)) == first_match_round]
+                                       m.pitch and (round_obj := ROUND_RE.search(m.pitch)) and 
+                                       int(round_obj.group(1)) == first_match_round]
                         break
         
         if first_match_round and first_match_round != round_number:
@@ -517,6 +528,133 @@ def get_round_name(num_teams):
         return "Final"
 
 
+def mark_tournament_completed_if_finished(tournament):
+    """Mark the tournament completed once it has matches and every one of them is finished"""
+    # Total and finished counts in one pass over the (tournament, status) index
+    match_counts = Match.objects.filter(tournament=tournament).aggregate(
+        total=Count('id'),
+        finished=Count('id', filter=Q(status='finished'))
+    )
+    total_matches = match_counts['total']
+    if total_matches == 0 or match_counts['finished'] != total_matches or tournament.status == 'completed':
+        return False
+    
+    tournament.status = 'completed'
+    tournament.save(update_fields=['status'])
+    logger.debug("Tournament %r marked as COMPLETED: all %d matches finished", tournament.name, total_matches)
+    return True
+
+
+def _run_with_tournament_lock(tournament_id, work):
+    """Run work(tournament) in one transaction holding the tournament's row lock, retrying transient DB errors"""
+    for attempt in range(BRACKET_TASK_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                # The row lock serialises bracket work across processes as well as threads, so the
+                # "round already exists" checks inside always see a round another worker just built
+                tournament = Tournament.objects.select_for_update().get(pk=tournament_id)
+                return work(tournament)
+        except OperationalError:
+            # Lock timeouts, deadlocks and "database is locked" are worth another try; the work is
+            # idempotent, so re-running it after a rollback can't build anything twice
+            if attempt == BRACKET_TASK_ATTEMPTS - 1:
+                raise
+            wait_time = 0.1 * (2 ** attempt)
+            logger.debug("Bracket work for tournament %s hit a DB error, retrying in %ss", tournament_id, wait_time)
+            time.sleep(wait_time)
+
+
+def _generate_next_knockout_round_task(tournament_id, completed_round_name, check_completion=False):
+    """Worker-thread body for queue_next_knockout_round"""
+    def work(tournament):
+        generate_next_knockout_round(tournament, completed_round_name)
+        if check_completion:
+            # Only once generation has run is it known whether another round was added
+            mark_tournament_completed_if_finished(tournament)
+    
+    try:
+        _run_with_tournament_lock(tournament_id, work)
+    except Exception:
+        logger.exception(
+            "Background next-round generation failed for tournament %s after '%s'; sync-brackets will rebuild it",
+            tournament_id, completed_round_name,
+        )
+    finally:
+        # Worker threads open their own connections; don't leave them dangling
+        connections.close_all()
+
+
+def queue_next_knockout_round(tournament, completed_round_name, check_completion=False):
+    """Generate the next knockout round on a background thread once the current transaction commits"""
+    tournament_id = tournament.id
+    transaction.on_commit(
+        lambda: _bracket_executor.submit(
+            _generate_next_knockout_round_task, tournament_id, completed_round_name, check_completion
+        )
+    )
+
+
+def _generate_knockout_stage_task(tournament_id):
+    """Worker-thread body for queue_knockout_stage_from_groups"""
+    def work(tournament):
+        if can_determine_group_qualifiers(tournament):
+            generate_knockout_stage_from_groups(tournament)
+        else:
+            logger.debug("Group stage not yet complete for tournament %s; qualifiers not determined", tournament_id)
+        mark_tournament_completed_if_finished(tournament)
+    
+    try:
+        _run_with_tournament_lock(tournament_id, work)
+    except Exception:
+        logger.exception(
+            "Background knockout stage generation failed for tournament %s; sync-brackets will rebuild it",
+            tournament_id,
+        )
+    finally:
+        connections.close_all()
+
+
+def queue_knockout_stage_from_groups(tournament):
+    """Build the knockout stage on a background thread once the group stage's last result commits"""
+    tournament_id = tournament.id
+    transaction.on_commit(lambda: _bracket_executor.submit(_generate_knockout_stage_task, tournament_id))
+
+
+def _sync_brackets(tournament):
+    """Build every bracket round the finished results call for, then re-check completion"""
+    generated = False
+    if can_determine_group_qualifiers(tournament):
+        generated = generate_knockout_stage_from_groups(tournament)
+    
+    # League pitches aren't rounds; only knockout and combination tournaments have a bracket
+    if tournament.format in ('knockout', 'combination'):
+        # Earliest round first, so a rebuilt round is in place before the round after it is considered;
+        # rounds whose successor already exists are skipped by generate_next_knockout_round itself
+        knockout_pitches = (
+            Match.objects.filter(tournament=tournament)
+            .exclude(pitch__icontains='Group')
+            .exclude(pitch='')
+            .order_by('kickoff_at', 'id')
+            .values_list('pitch', flat=True)
+        )
+        for round_name in dict.fromkeys(knockout_pitches):
+            generated = generate_next_knockout_round(tournament, round_name) or generated
+    
+    mark_tournament_completed_if_finished(tournament)
+    return generated, tournament.status
+
+
+def sync_tournament_brackets(tournament):
+    """
+    Synchronously build any knockout rounds that finished results call for but that don't exist yet.
+    Safe to run repeatedly; it is the recovery path when a queued bracket task failed.
+    
+    Returns:
+        tuple: (whether any round was created, the tournament's status afterwards)
+    """
+    return _run_with_tournament_lock(tournament.id, _sync_brackets)
+
+
 def generate_next_knockout_round(tournament, completed_round_name):
     """
     Generate the next round of knockout matches after a round completes.
@@ -758,6 +896,9 @@ def generate_next_knockout_round(tournament, completed_round_name):
         else:
             logger.debug(f"  ✓ Next round '{next_round_name}' does not exist. Proceeding with creation.")
             logger.debug(f"{'='*60}\n")
+    except OperationalError:
+        # Transient DB errors go back to the caller, which may retry the whole generation
+        raise
     except Exception as e:
         logger.exception("Error checking existing next round: %s", e)
         return False
@@ -786,25 +927,29 @@ def generate_next_knockout_round(tournament, completed_round_name):
     logger.debug(f"Next round date: {next_round_date}")
     
     try:
-        for i in range(num_matches):
-            home_team = winners[i * 2]
-            away_team = winners[i * 2 + 1]
-            
-            if not home_team or not away_team:
-                logger.debug(f"✗ Warning: Skipping match {i+1} - missing team (home: {home_team}, away: {away_team})")
-                continue
-            
-            logger.debug(f"  Creating match {i+1}/{num_matches}: {home_team.name} vs {away_team.name}")
-            match = Match.objects.create(
-                tournament=tournament,
-                home_team=home_team,
-                away_team=away_team,
-                kickoff_at=next_round_date,
-                status='scheduled',
-                pitch=next_round_name
-            )
-            matches_created += 1
-            logger.debug(f"  ✓ Created match {match.id}: {home_team.name} vs {away_team.name} in {next_round_name}")
+        # All of the round's matches are created or none are, so a failed attempt can simply be re-run
+        with transaction.atomic():
+            for i in range(num_matches):
+                home_team = winners[i * 2]
+                away_team = winners[i * 2 + 1]
+                
+                if not home_team or not away_team:
+                    logger.debug(f"✗ Warning: Skipping match {i+1} - missing team (home: {home_team}, away: {away_team})")
+                    continue
+                
+                logger.debug(f"  Creating match {i+1}/{num_matches}: {home_team.name} vs {away_team.name}")
+                match = Match.objects.create(
+                    tournament=tournament,
+                    home_team=home_team,
+                    away_team=away_team,
+                    kickoff_at=next_round_date,
+                    status='scheduled',
+                    pitch=next_round_name
+                )
+                matches_created += 1
+                logger.debug(f"  ✓ Created match {match.id}: {home_team.name} vs {away_team.name} in {next_round_name}")
+    except OperationalError:
+        raise
     except Exception as e:
         logger.exception("Error creating matches in generate_next_knockout_round: %s", e)
         return False
@@ -833,6 +978,17 @@ def can_determine_group_qualifiers(tournament):
     if combination_type != 'combinationB':
         return False
     
+    # Get all group matches
+    all_group_matches = Match.objects.filter(
+        tournament=tournament,
+        pitch__icontains='Group'
+    )
+    
+    # An unfinished group match rules qualifiers out, and it is the usual case while the group
+    # stage is being scored, so this single EXISTS probe runs before anything else
+    if all_group_matches.exclude(status='finished').exists() or not all_group_matches.exists():
+        return False
+    
     # Check if knockout stage already exists
     knockout_matches = Match.objects.filter(
         tournament=tournament
@@ -851,20 +1007,7 @@ def can_determine_group_qualifiers(tournament):
     # Get groups
     groups = generate_groups(teams, "combinationB")
     
-    # Get all group matches
-    all_group_matches = Match.objects.filter(
-        tournament=tournament,
-        pitch__icontains='Group'
-    )
-    
-    # Check if all group matches are finished
-    finished_group_matches = all_group_matches.filter(status='finished')
-    
-    # If all group matches are finished, qualifiers can be determined
-    if finished_group_matches.count() == all_group_matches.count() and all_group_matches.count() > 0:
-        return True
-    
-    return False
+    return True
 
 
 def generate_knockout_stage_from_groups(tournament):
@@ -877,7 +1020,7 @@ def generate_knockout_stage_from_groups(tournament):
         bool: True if knockout stage was created, False otherwise
     """
     from .models import Match, Team
-    from .tournament_formats import generate_groups, calculate_group_standings
+    from .tournament_formats import generate_groups, calculate_group_standings, matches_by_group
     from datetime import timedelta
     
     # Check if knockout stage already exists
@@ -901,15 +1044,14 @@ def generate_knockout_stage_from_groups(tournament):
     
     # Get all finished matches for standings calculation
     all_matches = list(Match.objects.filter(tournament=tournament, status='finished'))
+    grouped_matches = matches_by_group(all_matches)
     
     # Calculate standings for each group and store qualifiers with group info
     group_qualifiers = {}  # {group_name: {'first': team, 'second': team}}
     for group in groups:
         group_name = group["name"]
         group_teams = group["teams"]
-        # Filter matches for this group
-        group_matches = [m for m in all_matches if m.pitch and m.pitch.startswith(group_name)]
-        standings_list = calculate_group_standings(group_teams, group_matches, group_name)
+        standings_list = calculate_group_standings(group_teams, grouped_matches.get(group_name, []), group_name)
         
         if standings_list and len(standings_list) >= 2:
             # Get top 2 teams
@@ -1243,8 +1385,9 @@ def simulate_match(match):
         match.home_team.draws += 1
         match.away_team.draws += 1
     
-    match.home_team.save()
-    match.away_team.save()
+    team_stat_fields = ['goals_for', 'goals_against', 'wins', 'draws', 'losses']
+    match.home_team.save(update_fields=team_stat_fields)
+    match.away_team.save(update_fields=team_stat_fields)
     
     # Update player stats (goals, assists, appearances)
     # Track which players have been updated to avoid double-counting
@@ -1261,7 +1404,7 @@ def simulate_match(match):
             scorer = Player.objects.get(id=scorer_id)
             scorer.goals += goal_count
             scorer.appearances += 1
-            scorer.save()
+            scorer.save(update_fields=['goals', 'appearances'])
             updated_players.add(scorer.id)
         except Player.DoesNotExist:
             continue
@@ -1272,12 +1415,12 @@ def simulate_match(match):
         if assist.player and assist.player.id not in updated_players:
             assist.player.assists += 1
             assist.player.appearances += 1
-            assist.player.save()
+            assist.player.save(update_fields=['assists', 'appearances'])
             updated_players.add(assist.player.id)
         elif assist.player:
             # Player already updated (scored), just add assist
             assist.player.assists += 1
-            assist.player.save()
+            assist.player.save(update_fields=['assists'])
     
     # Update appearances for remaining players who played (didn't score/assist)
     # For simplicity, we'll mark a subset of remaining players as having appeared
@@ -1288,22 +1431,22 @@ def simulate_match(match):
     # Mark about 7-9 additional players per team as having appeared (realistic squad size)
     for player in remaining_home[:random.randint(7, 9)]:
         player.appearances += 1
-        player.save()
+        player.save(update_fields=['appearances'])
     
     for player in remaining_away[:random.randint(7, 9)]:
         player.appearances += 1
-        player.save()
+        player.save(update_fields=['appearances'])
     
     # Update clean sheets for goalkeepers
     # Home team goalkeeper gets clean sheet if away_score == 0
     home_gk = [p for p in home_players if p.position == 'GK']
     if home_gk and away_score == 0:
         home_gk[0].clean_sheets += 1
-        home_gk[0].save()
+        home_gk[0].save(update_fields=['clean_sheets'])
     
     # Away team goalkeeper gets clean sheet if home_score == 0
     away_gk = [p for p in away_players if p.position == 'GK']
     if away_gk and home_score == 0:
         away_gk[0].clean_sheets += 1
-        away_gk[0].save()
+        away_gk[0].save(update_fields=['clean_sheets'])
 
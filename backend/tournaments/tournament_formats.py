@@ -3,6 +3,7 @@ NEW: Tournament format utilities for dynamic fixture generation
 Supports League, Knockout, and Combination formats without breaking existing models
 """
 import logging
+from collections import defaultdict
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 from django.utils import timezone
@@ -119,7 +120,6 @@ def generate_round_robin_for_group(group_teams: List[Team], tournament: Tourname
         # Return existing matches organized by round
         existing_list = list(existing_matches)
         # Group by round number extracted from pitch
-        from collections import defaultdict
         by_round = defaultdict(list)
         for m in existing_list:
             # Extract round number from pitch (e.g., "Group A - Round 3" -> 3)
@@ -598,25 +598,10 @@ def generate_fixtures_for_tournament(tournament: Tournament) -> List[Match]:
         return matches
 
 
-def calculate_group_standings(teams: List[Team], matches: List[Match], group_name: str) -> List[Dict]:
-    """
-    Calculate standings for a specific group (for combinationB format)
-    Returns sorted list of team standings dicts
-    
-    Important: The "played" column counts ALL scheduled matches for the team,
-    while wins/draws/losses/goals only count from FINISHED matches.
-    This ensures all teams show the same total games (if fixtures are complete).
-    """
-    # Filter matches for this group (pitch field format: "Group A - Round 1", "Group A - Round 2", etc.)
-    # Include ALL matches (scheduled and finished) for counting total games played
-    all_group_matches = [m for m in matches if m.pitch and m.pitch.startswith(group_name)]
-    # Only finished matches are used for stats (wins, draws, losses, goals)
-    finished_group_matches = [m for m in all_group_matches if m.status == 'finished']
-    
-    # Initialize standings for each team
-    standings = {}
-    for team in teams:
-        standings[team.id] = {
+def _empty_group_standings(teams: List[Team]) -> Dict[int, Dict]:
+    """Initial zeroed standings row for each team, keyed by team id"""
+    return {
+        team.id: {
             'team': team,
             'played': 0,  # Will count ALL scheduled matches
             'wins': 0,
@@ -627,70 +612,115 @@ def calculate_group_standings(teams: List[Team], matches: List[Match], group_nam
             'goal_difference': 0,
             'points': 0
         }
+        for team in teams
+    }
+
+
+def _tally_group_match(standings: Dict[int, Dict], match: Match) -> None:
+    """Add one group match to the standings ("played" always, results only if finished)"""
+    # Use the raw FK ids so no Team row is loaded per match
+    home = standings.get(match.home_team_id)
+    away = standings.get(match.away_team_id)
+    
+    # Count all matches (scheduled or finished) for "played" column
+    if home:
+        home['played'] += 1
+    if away:
+        away['played'] += 1
+    
+    if match.status != 'finished':
+        return
+    
+    home_score = match.home_score or 0
+    away_score = match.away_score or 0
+    
+    # Update goals (only for finished matches)
+    if home:
+        home['goals_for'] += home_score
+        home['goals_against'] += away_score
+    if away:
+        away['goals_for'] += away_score
+        away['goals_against'] += home_score
+    
+    # Determine result (only for finished matches)
+    if home_score > away_score:
+        if home:
+            home['wins'] += 1
+            home['points'] += 3
+        if away:
+            away['losses'] += 1
+    elif away_score > home_score:
+        if away:
+            away['wins'] += 1
+            away['points'] += 3
+        if home:
+            home['losses'] += 1
+    else:
+        if home:
+            home['draws'] += 1
+            home['points'] += 1
+        if away:
+            away['draws'] += 1
+            away['points'] += 1
+
+
+def _finalize_group_standings(standings: Dict[int, Dict]) -> List[Dict]:
+    """Fill in goal difference and sort by points, then goal difference, then goals for"""
+    for row in standings.values():
+        row['goal_difference'] = row['goals_for'] - row['goals_against']
     
-    # Count total scheduled matches per team (for "played" column)
-    # This ensures all teams show the same number of games if fixtures are complete
-    for match in all_group_matches:
-        home_team_id = match.home_team.id
-        away_team_id = match.away_team.id
-        
-        # Count all matches (scheduled or finished) for "played" column
-        if home_team_id in standings:
-            standings[home_team_id]['played'] += 1
-        if away_team_id in standings:
-            standings[away_team_id]['played'] += 1
-    
-    # Process ONLY finished matches for stats (wins, draws, losses, goals, points)
-    for match in finished_group_matches:
-        home_team_id = match.home_team.id
-        away_team_id = match.away_team.id
-        
-        home_score = match.home_score or 0
-        away_score = match.away_score or 0
-        
-        # Update goals (only for finished matches)
-        if home_team_id in standings:
-            standings[home_team_id]['goals_for'] += home_score
-            standings[home_team_id]['goals_against'] += away_score
-        if away_team_id in standings:
-            standings[away_team_id]['goals_for'] += away_score
-            standings[away_team_id]['goals_against'] += home_score
-        
-        # Determine result (only for finished matches)
-        if home_score > away_score:
-            if home_team_id in standings:
-                standings[home_team_id]['wins'] += 1
-                standings[home_team_id]['points'] += 3
-            if away_team_id in standings:
-                standings[away_team_id]['losses'] += 1
-        elif away_score > home_score:
-            if away_team_id in standings:
-                standings[away_team_id]['wins'] += 1
-                standings[away_team_id]['points'] += 3
-            if home_team_id in standings:
-                standings[home_team_id]['losses'] += 1
-        else:
-            if home_team_id in standings:
-                standings[home_team_id]['draws'] += 1
-                standings[home_team_id]['points'] += 1
-            if away_team_id in standings:
-                standings[away_team_id]['draws'] += 1
-                standings[away_team_id]['points'] += 1
-    
-    # Calculate goal difference
-    for team_id in standings:
-        standings[team_id]['goal_difference'] = (
-            standings[team_id]['goals_for'] - standings[team_id]['goals_against']
-        )
-    
-    # Sort by points, then goal difference, then goals for
-    sorted_standings = sorted(
+    return sorted(
         standings.values(),
         key=lambda x: (x['points'], x['goal_difference'], x['goals_for']),
         reverse=True
     )
+
+
+def matches_by_group(matches: List[Match]) -> Dict[str, List[Match]]:
+    """
+    Bucket matches by the group their pitch names, in one pass over the matches
+    Pitch format is "Group A - Round 1", so the key is everything before the first " - "
+    """
+    grouped = defaultdict(list)
+    for match in matches:
+        if match.pitch:
+            grouped[match.pitch.partition(' - ')[0]].append(match)
+    return grouped
+
+
+def calculate_group_standings(teams: List[Team], matches: List[Match], group_name: str) -> List[Dict]:
+    """
+    Calculate standings for a specific group (for combinationB format)
+    Returns sorted list of team standings dicts
+    
+    Important: The "played" column counts ALL scheduled matches for the team,
+    while wins/draws/losses/goals only count from FINISHED matches.
+    This ensures all teams show the same total games (if fixtures are complete).
+    """
+    standings = _empty_group_standings(teams)
+    
+    # Filter matches for this group (pitch field format: "Group A - Round 1", "Group A - Round 2", etc.)
+    for match in matches:
+        if match.pitch and match.pitch.startswith(group_name):
+            _tally_group_match(standings, match)
     
-    return sorted_standings
+    return _finalize_group_standings(standings)
+
+
+def calculate_all_group_standings(groups: List[Dict], matches: List[Match]) -> Dict[str, List[Dict]]:
+    """
+    Calculate standings for every group in one pass over the matches
+    Returns {group_name: sorted standings list}, same rows as calculate_group_standings
+    """
+    grouped = matches_by_group(matches)
+    group_standings = {}
+    for group in groups:
+        standings = _empty_group_standings(group['teams'])
+        for match in grouped.get(group['name'], ()):
+            _tally_group_match(standings, match)
+        group_standings[group['name']] = _finalize_group_standings(standings)
+    
+    return group_standings
 
 
 def validate_round_robin_completeness(group_teams: List[Team], matches: List[Match], group_name: str) -> Dict:
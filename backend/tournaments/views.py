@@ -1,23 +1,115 @@
 # tournaments/views.py
 import logging
+import traceback
+from collections import Counter
+from datetime import datetime
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.views import APIView
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import Q, F, Count, Case, When, Value, IntegerField, Prefetch, prefetch_related_objects
+from django.db.models.functions import Concat, Trim
+from django.utils import timezone
 from .models import Venue, Tournament, Team, Registration, Match, Player, TeamPlayer, MatchScorer, MatchAssist, Referee, MatchReferee
-from .serializers import VenueSerializer, TournamentSerializer, TeamSerializer, RegistrationSerializer, MatchSerializer, UserSerializer, RegistrationCreateSerializer, PlayerSerializer, TeamPlayerSerializer
+from .serializers import VenueSerializer, TournamentSerializer, TeamSerializer, RegistrationSerializer, MatchSerializer, UserSerializer, RegistrationCreateSerializer, PlayerSerializer, TeamPlayerSerializer, TournamentListSerializer, SetScoreSerializer
 from .permissions import IsOrganizerOrReadOnly, IsOrganizerOfRelatedTournamentOrReadOnly, IsTeamManagerOrHost, IsTournamentOrganiser, IsTeamManagerOrReadOnly, IsMatchRefereeOrOrganizer, IsOrganiser
-from accounts.serializers import UserWithRoleSerializer
+from .tournament_formats import generate_groups, calculate_all_group_standings, generate_fixtures_for_tournament, validate_round_robin_completeness, generate_round_robin_for_group, matches_by_group
+from .simulation_helpers import simulate_round as simulate_round_helper, generate_next_knockout_round, queue_next_knockout_round, queue_knockout_stage_from_groups, mark_tournament_completed_if_finished, generate_knockout_stage_from_groups, can_determine_group_qualifiers, sync_tournament_brackets
+from .seed_helpers import seed_test_teams as seed_teams_helper
+from .awards import AWARDS_CACHE_TIMEOUT, awards_cache_key, get_tournament_team_ids, get_top_scorer, get_mvp, get_tournament_winner, get_tournament_runner_up, get_tournament_third_place, get_clean_sheets_leader
+from .guards import get_registration_status
+from .emails import queue_payment_confirmation
+from accounts.serializers import UserWithRoleSerializer, user_role_cache_key, USER_ROLE_CACHE_TIMEOUT
 
 
 logger = logging.getLogger(__name__)
 
+# Permission classes shared by the viewsets' get_permissions; instances are built per request, as DRF
+# expects, so a permission that keeps request state can never leak it into another request
+_PUBLIC_PERMISSION_CLASSES = (AllowAny,)
+_ORGANISER_PERMISSION_CLASSES = (IsAuthenticated, IsOrganiser)
+
+
+# "First Last" as the database builds it, trimmed like str.strip() when either part is blank
+_PLAYER_FULL_NAME = Trim(Concat('first_name', Value(' '), 'last_name'))
+
+
+def _tournament_memberships(team_ids):
+    """Prefetch a player's memberships (with team) among the given teams as `tournament_memberships`"""
+    return Prefetch(
+        'memberships',
+        queryset=TeamPlayer.objects.filter(team_id__in=team_ids).select_related('team').order_by('id'),
+        to_attr='tournament_memberships',
+    )
+
+
+def _clear_team_awards_cache(team_ids):
+    """Drop the cached awards of every tournament the given teams are registered in"""
+    tournament_ids = Registration.objects.filter(team_id__in=team_ids).values_list('tournament_id', flat=True).distinct()
+    cache.delete_many([awards_cache_key(tournament_id) for tournament_id in tournament_ids])
+
+
+def _is_knockout_match(match):
+    """True for knockout-format matches and the non-group stage of combination tournaments"""
+    tournament_format = match.tournament.format
+    return tournament_format == 'knockout' or (
+        tournament_format == 'combination' and bool(match.pitch) and 'Group' not in match.pitch
+    )
+
+
+def _score_unchanged(match, home_score, away_score, penalties,
+                     home_scorers, home_assists, away_scorers, away_assists):
+    """True if a finished match already stores exactly this result, goals and assists"""
+    if (match.status != 'finished'
+            or (match.home_score, match.away_score) != (home_score, away_score)
+            or (match.home_penalties, match.away_penalties) != penalties):
+        return False
+    
+    # Stored goals in insertion order as (team, scorer, assister); relies on the
+    # scorers/assists the MatchViewSet queryset already prefetches
+    assisters = {assist.goal_id: assist.player_id for assist in match.assists.all()}
+    stored = [
+        (scorer.team_id, scorer.player_id, assisters.pop(scorer.id, None))
+        for scorer in sorted(match.scorers.all(), key=lambda scorer: scorer.id)
+    ]
+    if assisters:
+        return False  # assists not tied to a goal in this match
+    
+    submitted = []
+    for team_id, scorer_ids, assist_ids in ((match.home_team_id, home_scorers, home_assists),
+                                            (match.away_team_id, away_scorers, away_assists)):
+        for idx, scorer_id in enumerate(scorer_ids):
+            assister_id = assist_ids[idx] if idx < len(assist_ids) else None
+            submitted.append((team_id, scorer_id, assister_id or None))
+    return stored == submitted
+
+
+def _queue_goals(match, team, scorer_ids, assist_ids, roster, goals_to_create, assists_to_create,
+                 goal_counts, assist_counts, appearances):
+    """Queue one side's goals/assists for bulk insert and tally the player stat increments"""
+    for idx, scorer_id in enumerate(scorer_ids):
+        # Only players on this side's roster can score for it
+        if scorer_id not in roster:
+            continue
+        goal = MatchScorer(match=match, player_id=scorer_id, team=team)
+        goals_to_create.append(goal)
+        goal_counts[scorer_id] += 1
+        appearances.add(scorer_id)
+        
+        # NEW: Assist (one per goal, optional) must also come from the same team
+        assister_id = assist_ids[idx] if idx < len(assist_ids) else None
+        if assister_id and assister_id in roster:
+            assists_to_create.append(MatchAssist(goal=goal, match=match, player_id=assister_id, team=team))
+            assist_counts[assister_id] += 1
+            appearances.add(assister_id)
+
 
 class RestrictedTokenObtainPairView(TokenObtainPairView):
     """
@@ -33,19 +125,18 @@ class RestrictedTokenObtainPairView(TokenObtainPairView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Check if user exists and is active
-        try:
-            user = User.objects.get(username=username)
-            if not user.is_active:
-                return Response(
-                    {'detail': 'Account is inactive.'},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except User.DoesNotExist:
+        # Check if user exists and is active (only the flag is needed; the token serializer loads the user itself)
+        is_active = User.objects.filter(username=username).values_list('is_active', flat=True).first()
+        if is_active is None:
             return Response(
                 {'detail': 'Invalid credentials.'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
+        if not is_active:
+            return Response(
+                {'detail': 'Account is inactive.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
         
         # Proceed with normal JWT token generation
         return super().post(request, *args, **kwargs)
@@ -72,25 +163,24 @@ class TournamentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'pk'  # Default lookup by ID
     
+    # Public endpoints (no auth required); every other action needs an authenticated organiser
+    PUBLIC_ACTIONS = frozenset({'list', 'retrieve', 'standings', 'top_scorers', 'top_assists', 'role', 'by_slug'})
+    
     def get_permissions(self):
         """Apply different permissions based on action"""
-        # Public endpoints (no auth required)
-        public_actions = ['list', 'retrieve', 'standings', 'top_scorers', 'top_assists', 'role', 'by_slug']
         # Handle both underscore and hyphen formats for action names
         action_name = self.action.replace('-', '_') if self.action else None
         
-        if self.action in public_actions or action_name in public_actions:
-            permission_classes = [AllowAny]
-        elif self.action in ['update', 'partial_update', 'destroy', 'generate_fixtures', 'publish', 'register']:
-            permission_classes = [IsAuthenticated, IsOrganiser]
-        elif self.action == 'create':
-            permission_classes = [IsAuthenticated, IsOrganiser]  # Only organiser can create
-        elif self.action in ['seed_test_teams', 'simulate_round', 'clear_fixtures', 'reset_tournament', 'reset_matches', 'remove_last_team', 'debug_knockout', 'validate_fixtures', 'generate_knockouts']:
-            permission_classes = [IsAuthenticated, IsOrganiser]
-        else:
-            permission_classes = [IsAuthenticated, IsOrganiser]
+        permission_classes = _PUBLIC_PERMISSION_CLASSES if action_name in self.PUBLIC_ACTIONS else _ORGANISER_PERMISSION_CLASSES
         return [permission() for permission in permission_classes]
     
+    def get_queryset(self):
+        """Join the nested venue/organizer for actions that serialize tournaments"""
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve', 'by_slug'):
+            queryset = queryset.select_related('organizer', 'venue')
+        return queryset
+    
     def perform_create(self, serializer):
         tournament = serializer.save(organizer=self.request.user)
         # Ensure user's role_hint is set to host
@@ -104,33 +194,37 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def mine(self, request):
         """Get tournaments organized by the current user"""
-        tournaments = self.queryset.filter(organizer=request.user)
-        serializer = self.get_serializer(tournaments, many=True)
+        tournaments = (
+            Tournament.objects.filter(organizer=request.user)
+            .select_related('venue')
+            .only(*TournamentListSerializer.Meta.fields)
+        )
+        serializer = TournamentListSerializer(tournaments, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'], url_path='awards', permission_classes=[AllowAny])
     def awards(self, request, pk=None):
         """Get tournament awards: Top Scorer, Top Assister, Clean Sheets Leader, MVP, Winners"""
         tournament = self.get_object()
-        from .awards import get_top_scorer, get_mvp, get_tournament_winner, get_tournament_runner_up, get_tournament_third_place, get_clean_sheets_leader
+        
+        # Served from cache on repeat hits; result/MVP changes drop the entry
+        key = awards_cache_key(tournament.id)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
         
         # Get top assister (player with most assists)
         top_assister = None
-        team_ids = Team.objects.filter(
-            registrations__tournament=tournament,
-            registrations__status__in=['pending', 'paid']
-        ).values_list('id', flat=True)
+        team_ids = get_tournament_team_ids(tournament)
         
         top_assister_player = Player.objects.filter(
             memberships__team_id__in=team_ids,
             assists__gt=0
-        ).order_by('-assists', '-goals').first()
+        ).prefetch_related(_tournament_memberships(team_ids)).order_by('-assists', '-goals').first()
         
         if top_assister_player:
-            team_player = TeamPlayer.objects.filter(
-                player=top_assister_player,
-                team_id__in=team_ids
-            ).select_related('team').first()
+            memberships = top_assister_player.tournament_memberships
+            team_player = memberships[0] if memberships else None
             
             top_assister = {
                 'player': {
@@ -146,15 +240,20 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 'assists': top_assister_player.assists or 0
             }
         
-        return Response({
-            'top_scorer': get_top_scorer(tournament),
+        # Top scorer and clean sheets only count finished matches; skip both until a result is in
+        has_finished = Match.objects.filter(tournament=tournament, status='finished').exists()
+        
+        data = {
+            'top_scorer': get_top_scorer(tournament) if has_finished else None,
             'top_assister': top_assister,
-            'clean_sheets_leader': get_clean_sheets_leader(tournament),
+            'clean_sheets_leader': get_clean_sheets_leader(tournament) if has_finished else None,
             'mvp': get_mvp(tournament),
             'winner': get_tournament_winner(tournament),
             'runner_up': get_tournament_runner_up(tournament),
             'third_place': get_tournament_third_place(tournament)
-        })
+        }
+        cache.set(key, data, AWARDS_CACHE_TIMEOUT)
+        return Response(data)
     
     @action(detail=True, methods=['get'], url_path='players-for-mvp', permission_classes=[IsAuthenticated, IsOrganiser])
     def players_for_mvp(self, request, pk=None):
@@ -162,21 +261,32 @@ class TournamentViewSet(viewsets.ModelViewSet):
         tournament = self.get_object()
         
         # Get all teams in tournament
-        team_ids = Team.objects.filter(
-            registrations__tournament=tournament,
-            registrations__status__in=['pending', 'paid']
-        ).values_list('id', flat=True)
+        team_ids = get_tournament_team_ids(tournament)
         
         # Get all players in those teams with their stats
         players_data = []
         matches = Match.objects.filter(tournament=tournament, status='finished')
         
+        # Per-player goal/assist counts in two GROUP BY queries rather than two COUNTs per player
+        goal_counts = dict(
+            MatchScorer.objects.filter(match__in=matches).order_by()
+            .values('player_id').annotate(total=Count('id')).values_list('player_id', 'total')
+        )
+        assist_counts = dict(
+            MatchAssist.objects.filter(match__in=matches).order_by()
+            .values('player_id').annotate(total=Count('id')).values_list('player_id', 'total')
+        )
+        
+        # All rosters in one query, grouped back by team to keep the team-by-team listing order
+        rosters = {team_id: [] for team_id in team_ids}
+        for tp in TeamPlayer.objects.filter(team_id__in=team_ids).select_related('player', 'team').order_by('id'):
+            rosters[tp.team_id].append(tp)
+        
         for team_id in team_ids:
-            team_players = TeamPlayer.objects.filter(team_id=team_id).select_related('player', 'team')
-            for tp in team_players:
+            for tp in rosters[team_id]:
                 player = tp.player
-                goals = MatchScorer.objects.filter(match__in=matches, player=player).count()
-                assists = MatchAssist.objects.filter(match__in=matches, player=player).count()
+                goals = goal_counts.get(player.id, 0)
+                assists = assist_counts.get(player.id, 0)
                 appearances = player.appearances or 0
                 
                 players_data.append({
@@ -200,7 +310,6 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], url_path='set-mvp', permission_classes=[IsAuthenticated, IsOrganiser])
     def set_mvp(self, request, pk=None):
         """Set the MVP player for tournament (organiser only)"""
-        from .awards import get_mvp
         tournament = self.get_object()
         player_id = request.data.get('player_id')
         
@@ -213,19 +322,22 @@ class TournamentViewSet(viewsets.ModelViewSet):
             registrations__status__in=['pending', 'paid']
         ).values_list('id', flat=True)
         
-        team_player = TeamPlayer.objects.filter(
+        in_tournament = TeamPlayer.objects.filter(
             player_id=player_id,
             team_id__in=team_ids
-        ).first()
+        ).exists()
         
-        if not team_player:
+        if not in_tournament:
             return Response({'detail': 'Player is not in this tournament'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Store MVP in tournament structure
-        structure = tournament.structure or {}
-        structure['selected_mvp_player_id'] = player_id
+        # Store MVP in tournament structure; re-read it under a row lock so a concurrent
+        # organiser edit to another structure key isn't overwritten with a stale copy
+        with transaction.atomic():
+            structure = Tournament.objects.select_for_update().values_list('structure', flat=True).get(pk=tournament.pk) or {}
+            structure['selected_mvp_player_id'] = player_id
+            Tournament.objects.filter(pk=tournament.pk).update(structure=structure)
         tournament.structure = structure
-        tournament.save(update_fields=['structure'])
+        cache.delete(awards_cache_key(tournament.id))
         
         return Response({
             'detail': 'MVP selected successfully',
@@ -235,11 +347,15 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='standings')
     def standings(self, request, pk=None):
         """Get tournament standings calculated from matches"""
-        from .tournament_formats import generate_groups, calculate_group_standings
-        
         tournament = self.get_object()
-        teams = list(Team.objects.filter(registrations__tournament=tournament, registrations__status__in=['pending', 'paid']).distinct())
-        matches = list(Match.objects.filter(tournament=tournament, status='finished'))
+        teams = list(
+            Team.objects.filter(registrations__tournament=tournament, registrations__status__in=['pending', 'paid'])
+            .distinct().select_related('manager_user').prefetch_related('memberships__player')
+        )
+        finished_matches = Match.objects.filter(tournament=tournament, status='finished')
+        
+        # Serialize every team in a single many=True pass rather than once per row
+        team_data = {team.id: data for team, data in zip(teams, TeamSerializer(teams, many=True).data)}
         
         # NEW: Handle combinationB format (Groups → Knockout) with group standings
         structure = tournament.structure or {}
@@ -247,18 +363,16 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         if tournament.format == 'combination' and combination_type == 'combinationB':
             # Return group-based standings
+            matches = finished_matches.only('pitch', 'status', 'home_team', 'away_team', 'home_score', 'away_score')
             groups = generate_groups(teams, 'combinationB')
             group_standings = {}
             
-            for group in groups:
-                group_name = group['name']
-                group_teams = group['teams']
-                standings_list = calculate_group_standings(group_teams, matches, group_name)
-                
+            # All groups are tallied in a single pass over the finished matches
+            for group_name, standings_list in calculate_all_group_standings(groups, matches).items():
                 # Convert to serialized format
                 group_standings[group_name] = [
                     {
-                        'team': TeamSerializer(stand['team']).data,
+                        'team': team_data[stand['team'].id],
                         'played': stand['played'],
                         'won': stand['wins'],
                         'drawn': stand['draws'],
@@ -278,44 +392,42 @@ class TournamentViewSet(viewsets.ModelViewSet):
             })
         
         # Regular standings (league or combinationA)
+        # One scan over the finished score lines, tallying both sides per team id
+        team_ids = {team.id for team in teams}
+        totals = {}
+        score_lines = finished_matches.values_list('home_team_id', 'away_team_id', 'home_score', 'away_score')
+        for home_id, away_id, home_score, away_score in score_lines:
+            for team_id, scored, conceded in ((home_id, home_score, away_score), (away_id, away_score, home_score)):
+                if team_id not in team_ids:
+                    continue
+                team_totals = totals.setdefault(team_id, {
+                    'played': 0, 'won': 0, 'drawn': 0, 'lost': 0, 'goals_for': 0, 'goals_against': 0
+                })
+                team_totals['played'] += 1
+                team_totals['goals_for'] += scored
+                team_totals['goals_against'] += conceded
+                if scored > conceded:
+                    team_totals['won'] += 1
+                elif scored == conceded:
+                    team_totals['drawn'] += 1
+                else:
+                    team_totals['lost'] += 1
+        
         standings = []
         for team in teams:
-            # Get matches for this team in this tournament
-            team_matches = [m for m in matches if m.home_team == team or m.away_team == team]
-            
-            played = len(team_matches)
-            wins = 0
-            draws = 0
-            losses = 0
-            goals_for = 0
-            goals_against = 0
-            
-            for match in team_matches:
-                if match.home_team == team:
-                    gf = match.home_score or 0
-                    ga = match.away_score or 0
-                else:
-                    gf = match.away_score or 0
-                    ga = match.home_score or 0
-                
-                goals_for += gf
-                goals_against += ga
-                
-                if gf > ga:
-                    wins += 1
-                elif gf == ga:
-                    draws += 1
-                else:
-                    losses += 1
+            team_totals = totals.get(team.id, {})
+            wins = team_totals.get('won', 0)
+            draws = team_totals.get('drawn', 0)
+            goals_for = team_totals.get('goals_for', 0)
+            goals_against = team_totals.get('goals_against', 0)
             
-            points = wins * 3 + draws
             standings.append({
-                'team': TeamSerializer(team).data,
-                'played': played,
+                'team': team_data[team.id],
+                'played': team_totals.get('played', 0),
                 'won': wins,
                 'drawn': draws,
-                'lost': losses,
-                'points': points,
+                'lost': team_totals.get('lost', 0),
+                'points': wins * 3 + draws,
                 'goals_for': goals_for,
                 'goals_against': goals_against,
                 'goal_difference': goals_for - goals_against
@@ -343,27 +455,22 @@ class TournamentViewSet(viewsets.ModelViewSet):
             registrations__status__in=['pending', 'paid']
         ).values_list('id', flat=True)
         
-        # Get players from those teams
+        # Get players from those teams; the team name rides along on the membership join
         players = Player.objects.filter(
             memberships__team_id__in=team_ids,
             goals__gt=0
-        ).order_by('-goals')[:10]
-        
-        scorers = []
-        for player in players:
-            # Get team name for this player
-            team_membership = TeamPlayer.objects.filter(
-                player=player,
-                team_id__in=team_ids
-            ).select_related('team').first()
-            
-            team_name = team_membership.team.name if team_membership else 'Unknown'
-            
-            scorers.append({
-                'name': f"{player.first_name} {player.last_name}".strip(),
-                'team': team_name,
-                'goals': player.goals or 0
-            })
+        ).annotate(
+            full_name=_PLAYER_FULL_NAME, team_name=F('memberships__team__name')
+        ).order_by('-goals').values('full_name', 'goals', 'team_name')[:10]
+        
+        scorers = [
+            {
+                'name': player['full_name'],
+                'team': player['team_name'],
+                'goals': player['goals'] or 0
+            }
+            for player in players
+        ]
         
         return Response(scorers)
     
@@ -377,28 +484,25 @@ class TournamentViewSet(viewsets.ModelViewSet):
             registrations__status__in=['pending', 'paid']
         ).values_list('id', flat=True)
         
-        # Get players from those teams with assists
+        # Get players from those teams with assists; the team name rides along on the membership join
         players = Player.objects.filter(
             memberships__team_id__in=team_ids,
             assists__gt=0
-        ).order_by('-assists', '-goals', 'first_name', 'last_name')[:10]
-        
-        assisters = []
-        for player in players:
-            # Get team name for this player
-            team_membership = TeamPlayer.objects.filter(
-                player=player,
-                team_id__in=team_ids
-            ).select_related('team').first()
-            
-            team_name = team_membership.team.name if team_membership else 'Unknown'
-            
-            assisters.append({
-                'name': f"{player.first_name} {player.last_name}".strip(),
-                'team': team_name,
-                'assists': player.assists or 0,
-                'goals': player.goals or 0  # Include goals for tiebreaking display
-            })
+        ).annotate(
+            full_name=_PLAYER_FULL_NAME, team_name=F('memberships__team__name')
+        ).order_by(
+            '-assists', '-goals', 'first_name', 'last_name'
+        ).values('full_name', 'goals', 'assists', 'team_name')[:10]
+        
+        assisters = [
+            {
+                'name': player['full_name'],
+                'team': player['team_name'],
+                'assists': player['assists'] or 0,
+                'goals': player['goals'] or 0  # Include goals for tiebreaking display
+            }
+            for player in players
+        ]
         
         return Response(assisters)
     
@@ -427,14 +531,18 @@ class TournamentViewSet(viewsets.ModelViewSet):
         tournament = self.get_object()
         
         # Check permission
-        if not request.user.is_authenticated or tournament.organizer_id != request.user.id:
+        if tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organiser can publish tournaments'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         tournament.status = 'open'
-        tournament.save()
+        if tournament.slug:
+            # Single-column UPDATE; no need to rewrite the whole row
+            Tournament.objects.filter(pk=tournament.pk).update(status='open')
+        else:
+            tournament.save()  # save() also backfills the missing slug
         
         return Response({
             'detail': 'Tournament published successfully',
@@ -445,21 +553,17 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], url_path='generate-fixtures')
     def generate_fixtures(self, request, pk=None):
         """Generate fixtures for tournament (organiser only)"""
-        from django.db import transaction
-        from .tournament_formats import generate_fixtures_for_tournament
-        
         tournament = self.get_object()
         
         # Check permission
-        if not request.user.is_authenticated or tournament.organizer_id != request.user.id:
+        if tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organiser can generate fixtures'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         # Check if fixtures already exist
-        existing_matches = Match.objects.filter(tournament=tournament).count()
-        if existing_matches > 0:
+        if Match.objects.filter(tournament=tournament).exists():
             return Response(
                 {'detail': 'Fixtures already exist. Delete existing matches first to regenerate.'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -470,11 +574,8 @@ class TournamentViewSet(viewsets.ModelViewSet):
             with transaction.atomic():
                 matches = generate_fixtures_for_tournament(tournament)
                 
-                # Save matches to database
-                created_matches = []
-                for match in matches:
-                    match.save()
-                    created_matches.append(match)
+                # Save matches to database in batched INSERTs rather than one per match
+                created_matches = Match.objects.bulk_create(matches, batch_size=500)
                 
                 # Validate fixture completeness after generation and FIX immediately if incomplete
                 validation_warnings = []
@@ -483,32 +584,28 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     structure = tournament.structure or {}
                     combination_type = structure.get('combination_type', 'combinationA')
                     if combination_type == 'combinationB':
-                        from .tournament_formats import generate_groups, validate_round_robin_completeness, generate_round_robin_for_group
-                        from datetime import datetime
-                        
                         groups = generate_groups(list(Team.objects.filter(
                             registrations__tournament=tournament,
                             registrations__status__in=['pending', 'paid']
                         ).distinct()), 'combinationB')
                         
-                        # Re-fetch matches after generation
-                        all_existing_matches = list(Match.objects.filter(tournament=tournament))
+                        # The tournament had no matches before this request, so the rows just inserted
+                        # are all of them; bucket them by group once instead of re-querying per group
+                        grouped_matches = matches_by_group(created_matches)
                         
                         for group in groups:
                             group_name = group['name']
                             group_teams = group['teams']
-                            validation_result = validate_round_robin_completeness(group_teams, all_existing_matches, group_name)
+                            validation_result = validate_round_robin_completeness(group_teams, grouped_matches.get(group_name, []), group_name)
                             
                             if not validation_result.get('valid', False):
                                 # DELETE ALL matches for this group and regenerate from scratch
-                                deleted_count = Match.objects.filter(
-                                    tournament=tournament,
-                                    pitch__startswith=group_name
-                                ).count()
-                                Match.objects.filter(
+                                # delete() reports per-model counts, so no separate COUNT query is needed
+                                _, deleted_by_model = Match.objects.filter(
                                     tournament=tournament,
                                     pitch__startswith=group_name
                                 ).delete()
+                                deleted_count = deleted_by_model.get(Match._meta.label, 0)
                                 
                                 # Regenerate all matches for this group
                                 start_date = datetime.now()
@@ -521,16 +618,14 @@ class TournamentViewSet(viewsets.ModelViewSet):
                                 )
                                 
                                 # Save new matches
-                                for round_num, match_obj in group_matches:
-                                    match_obj.save()
-                                    created_matches.append(match_obj)
-                                    matches_regenerated += 1
-                                
-                                # Update all_existing_matches list
-                                all_existing_matches = list(Match.objects.filter(tournament=tournament))
+                                regenerated = Match.objects.bulk_create(
+                                    [match_obj for round_num, match_obj in group_matches], batch_size=500
+                                )
+                                created_matches.extend(regenerated)
+                                matches_regenerated += len(regenerated)
                                 
-                                # Re-validate
-                                validation_result = validate_round_robin_completeness(group_teams, all_existing_matches, group_name)
+                                # Re-validate (the group's old matches were all deleted, so only the new ones count)
+                                validation_result = validate_round_robin_completeness(group_teams, regenerated, group_name)
                                 if not validation_result.get('valid', False):
                                     validation_warnings.append(f"{group_name}: Still incomplete after regeneration")
                                 else:
@@ -548,6 +643,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     response_data['validation_warnings'] = validation_warnings
                     response_data['warning_message'] = 'Fixtures generated but some validation issues may remain. Use "Fix Fixtures" button to repair.'
                 
+                cache.delete(awards_cache_key(tournament.id))
                 return Response(response_data, status=status.HTTP_200_OK)
         except Exception as e:
             return Response(
@@ -558,12 +654,10 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], url_path='seed-test-teams', permission_classes=[IsAuthenticated, IsTournamentOrganiser])
     def seed_test_teams(self, request, pk=None):
         """Seed test teams for tournament (organiser only)"""
-        from .seed_helpers import seed_test_teams as seed_teams_helper
-        
         tournament = self.get_object()
         
         # Check permission
-        if not request.user.is_authenticated or tournament.organizer_id != request.user.id:
+        if tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organiser can seed test teams'},
                 status=status.HTTP_403_FORBIDDEN
@@ -605,6 +699,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            cache.delete(awards_cache_key(tournament.id))
             return Response(result, status=status.HTTP_200_OK)
         except Exception as e:
             return Response(
@@ -618,7 +713,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
         tournament = self.get_object()
         
         # Check permission
-        if not request.user.is_authenticated or tournament.organizer_id != request.user.id:
+        if tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organiser can remove teams'},
                 status=status.HTTP_403_FORBIDDEN
@@ -640,6 +735,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         # Delete the registration (team itself is not deleted, just the registration)
         last_registration.delete()
+        cache.delete(awards_cache_key(tournament.id))
         
         # Get remaining team count
         remaining_count = tournament.registrations.filter(
@@ -657,12 +753,10 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], url_path='simulate-round', permission_classes=[IsAuthenticated, IsTournamentOrganiser])
     def simulate_round(self, request, pk=None):
         """Simulate one round of matches for tournament (organiser only)"""
-        from .simulation_helpers import simulate_round as simulate_round_helper
-        
         tournament = self.get_object()
         
         # Check permission
-        if not request.user.is_authenticated or tournament.organizer_id != request.user.id:
+        if tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organiser can simulate rounds'},
                 status=status.HTTP_403_FORBIDDEN
@@ -677,6 +771,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            cache.delete(awards_cache_key(tournament.id))
             return Response(result, status=status.HTTP_200_OK)
         except Exception as e:
             return Response(
@@ -688,16 +783,18 @@ class TournamentViewSet(viewsets.ModelViewSet):
     def debug_knockout(self, request, pk=None):
         """Debug endpoint to check knockout round generation state"""
         tournament = self.get_object()
-        from .models import Match
         
-        # Get all knockout matches (exclude group stage)
+        # Get all knockout matches (exclude group stage), joining both teams for their names
         knockout_matches = Match.objects.filter(
             tournament=tournament
-        ).exclude(pitch__icontains='Group').order_by('pitch', 'kickoff_at')
+        ).exclude(pitch__icontains='Group').select_related('home_team', 'away_team').only(
+            'pitch', 'status', 'home_score', 'away_score', 'home_penalties', 'away_penalties',
+            'home_team__name', 'away_team__name'
+        ).order_by('pitch', 'kickoff_at')
         
-        # Group by round name
+        # Group by round name, streaming rows rather than filling the queryset's result cache
         rounds = {}
-        for match in knockout_matches:
+        for match in knockout_matches.iterator(chunk_size=500):
             round_name = match.pitch or 'Unknown'
             if round_name not in rounds:
                 rounds[round_name] = {
@@ -738,10 +835,8 @@ class TournamentViewSet(viewsets.ModelViewSet):
         generation_result = None
         if should_generate:
             try:
-                from .simulation_helpers import generate_next_knockout_round
                 generation_result = generate_next_knockout_round(tournament, 'Semi-Finals')
             except Exception as e:
-                import traceback
                 generation_result = {'error': str(e), 'traceback': traceback.format_exc()}
         
         debug_info = {
@@ -774,22 +869,25 @@ class TournamentViewSet(viewsets.ModelViewSet):
         tournament = self.get_object()
         
         # Check permission
-        if not request.user.is_authenticated or tournament.organizer_id != request.user.id:
+        if tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organiser can clear fixtures'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Count matches before deletion
-        match_count = Match.objects.filter(tournament=tournament).count()
-        
-        # Delete all matches (MatchScorer and MatchAssist will be deleted via CASCADE)
-        deleted_count = Match.objects.filter(tournament=tournament).delete()[0]
+        # Delete goal/assist rows by direct FK filter first so the collector does not have
+        # to load every child into memory when cascading from Match
+        with transaction.atomic():
+            MatchAssist.objects.filter(match__tournament=tournament).delete()
+            MatchScorer.objects.filter(match__tournament=tournament).delete()
+            # Report matches only; delete()'s total also counts cascaded referee assignments
+            deleted_count = Match.objects.filter(tournament=tournament).delete()[1].get(Match._meta.label, 0)
         
         # Clear selected MVP (since fixtures are being cleared)
         if tournament.structure and 'selected_mvp_player_id' in tournament.structure:
             tournament.structure.pop('selected_mvp_player_id')
             tournament.save(update_fields=['structure'])
+        cache.delete(awards_cache_key(tournament.id))
         
         return Response({
             'detail': f'Successfully deleted {deleted_count} matches',
@@ -801,72 +899,51 @@ class TournamentViewSet(viewsets.ModelViewSet):
     def reset_matches(self, request, pk=None):
         """Reset all match results (scores, status) back to start, keeping teams and players.
         Deletes knockout matches, resets group matches."""
-        from django.db import transaction
-        
         tournament = self.get_object()
         
-        # Check permission
-        if not request.user.is_authenticated or not request.user.is_staff:
-            return Response(
-                {'detail': 'Only organisers can reset matches'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         with transaction.atomic():
             # Get all matches for this tournament
             all_matches = Match.objects.filter(tournament=tournament)
             
-            # Separate group matches from knockout matches
-            group_matches = []
-            knockout_matches = []
+            # Separate knockout matches from group matches in the query rather than in Python
+            if tournament.format == 'knockout':
+                # All matches in knockout format are knockout matches
+                knockout_matches = all_matches
+            elif tournament.format == 'combination':
+                # In combination format, knockout matches don't have 'Group' in pitch
+                knockout_matches = all_matches.exclude(pitch='').exclude(pitch__contains='Group')
+            else:
+                knockout_matches = all_matches.none()
             
-            for match in all_matches:
-                is_knockout = False
-                if tournament.format == 'knockout':
-                    # All matches in knockout format are knockout matches
-                    is_knockout = True
-                elif tournament.format == 'combination':
-                    # In combination format, knockout matches don't have 'Group' in pitch
-                    if match.pitch and 'Group' not in match.pitch:
-                        is_knockout = True
-                
-                if is_knockout:
-                    knockout_matches.append(match)
-                else:
-                    group_matches.append(match)
+            # Every goal and assist in the tournament is wiped (group results are reset too), so clear
+            # them once up front by direct FK filter; the knockout delete then has no children to cascade
+            MatchAssist.objects.filter(match__tournament=tournament).delete()
+            MatchScorer.objects.filter(match__tournament=tournament).delete()
             
-            # Delete all knockout matches (and their related data will cascade)
-            knockout_matches_deleted = len(knockout_matches)
-            for match in knockout_matches:
-                # Delete scorers and assists first (they have FKs to match)
-                MatchScorer.objects.filter(match=match).delete()
-                MatchAssist.objects.filter(goal__match=match).delete()
-                match.delete()
+            # Delete all knockout matches in one pass
+            _, deleted_by_model = knockout_matches.delete()
+            knockout_matches_deleted = deleted_by_model.get(Match._meta.label, 0)
             
-            # Reset group match scores, penalties, and status
-            matches_reset = 0
-            for match in group_matches:
-                match.home_score = 0
-                match.away_score = 0
-                match.home_penalties = None
-                match.away_penalties = None
-                match.status = 'scheduled'
-                match.save()
-                matches_reset += 1
+            # Whatever is left are group matches: reset scores, penalties, and status in one UPDATE
+            matches_reset = all_matches.update(
+                home_score=0,
+                away_score=0,
+                home_penalties=None,
+                away_penalties=None,
+                status='scheduled'
+            )
             
-            # Delete all remaining match scorers and assists for group matches (should be empty but be safe)
-            MatchScorer.objects.filter(match__tournament=tournament).delete()
-            MatchAssist.objects.filter(goal__match__tournament=tournament).delete()
+            # Tournament fields changed below are written together in a single save at the end
+            dirty_fields = []
             
             # Reset tournament status to 'open' if it was completed
             if tournament.status == 'completed':
                 tournament.status = 'open'
-                tournament.save(update_fields=['status'])
+                dirty_fields.append('status')
             
-            # Reset team stats (wins, draws, losses, goals_for, goals_against)
-            team_ids = tournament.registrations.filter(
-                status__in=['pending', 'paid']
-            ).values_list('team_id', flat=True)
+            # Reset team stats (wins, draws, losses, goals_for, goals_against); the team IDs are
+            # materialized once so both UPDATEs get a literal IN list rather than re-running a subquery
+            team_ids = get_tournament_team_ids(tournament)
             
             Team.objects.filter(id__in=team_ids).update(
                 wins=0,
@@ -889,7 +966,11 @@ class TournamentViewSet(viewsets.ModelViewSet):
             # Clear selected MVP (since tournament is being reset)
             if tournament.structure and 'selected_mvp_player_id' in tournament.structure:
                 tournament.structure.pop('selected_mvp_player_id')
-                tournament.save(update_fields=['structure'])
+                dirty_fields.append('structure')
+            
+            if dirty_fields:
+                tournament.save(update_fields=dirty_fields)
+        cache.delete(awards_cache_key(tournament.id))
         
         return Response({
             'detail': f'Successfully reset {matches_reset} group matches and deleted {knockout_matches_deleted} knockout matches',
@@ -905,10 +986,6 @@ class TournamentViewSet(viewsets.ModelViewSet):
         Fix incomplete fixtures by regenerating matches for groups that don't have all required matches.
         This will delete incomplete matches and regenerate them properly.
         """
-        from django.db import transaction
-        from .tournament_formats import generate_groups, validate_round_robin_completeness, generate_round_robin_for_group
-        from datetime import datetime
-        
         tournament = self.get_object()
         
         if tournament.format != 'combination':
@@ -925,10 +1002,11 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 'skipped': True
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        # Grouping and round-robin checks only read each team's id and name
         teams = list(Team.objects.filter(
             registrations__tournament=tournament,
             registrations__status__in=['pending', 'paid']
-        ).distinct())
+        ).distinct().only('id', 'name'))
         
         if len(teams) < 2:
             return Response({
@@ -940,7 +1018,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         fixed_groups = []
         matches_deleted = 0
-        matches_created = 0
+        new_matches = []
         
         with transaction.atomic():
             for group in groups:
@@ -959,8 +1037,8 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 
                 if not validation_result.get('valid', False):
                     # Delete all existing matches for this group
-                    count = existing_matches.count()
-                    existing_matches.delete()
+                    _, deleted_by_model = existing_matches.delete()
+                    count = deleted_by_model.get(Match._meta.label, 0)
                     matches_deleted += count
                     
                     # Regenerate all matches for this group
@@ -973,16 +1051,18 @@ class TournamentViewSet(viewsets.ModelViewSet):
                         start_round=1
                     )
                     
-                    # Save new matches
-                    for round_num, match_obj in group_matches:
-                        match_obj.save()
-                        matches_created += 1
+                    new_matches.extend(match_obj for round_num, match_obj in group_matches)
                     
                     fixed_groups.append({
                         'group': group_name,
                         'matches_deleted': count,
                         'matches_created': len(group_matches)
                     })
+            
+            # Save every regenerated group's matches together in batched INSERTs; groups have
+            # distinct pitch prefixes, so deferring the inserts doesn't affect later groups' checks
+            Match.objects.bulk_create(new_matches, batch_size=500)
+        matches_created = len(new_matches)
         
         if not fixed_groups:
             return Response({
@@ -992,6 +1072,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 'matches_created': 0
             }, status=status.HTTP_200_OK)
         
+        cache.delete(awards_cache_key(tournament.id))
         return Response({
             'detail': f'Fixed {len(fixed_groups)} group(s). Deleted {matches_deleted} incomplete matches, created {matches_created} new matches.',
             'fixed_groups': fixed_groups,
@@ -1002,8 +1083,6 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='validate-fixtures', permission_classes=[IsAuthenticated, IsOrganiser])
     def validate_fixtures(self, request, pk=None):
         """Validate that all teams have equal number of scheduled matches (for round-robin groups)"""
-        from .tournament_formats import generate_groups, validate_round_robin_completeness
-        
         tournament = self.get_object()
         
         # Only validate combinationB format (Groups → Knockout)
@@ -1024,16 +1103,20 @@ class TournamentViewSet(viewsets.ModelViewSet):
             })
         
         # Get all teams and matches
+        # Grouping and round-robin checks only read each team's id and name
         teams = list(Team.objects.filter(
             registrations__tournament=tournament,
             registrations__status__in=['pending', 'paid']
-        ).distinct())
+        ).distinct().only('id', 'name'))
         
-        all_matches = list(Match.objects.filter(tournament=tournament))
+        all_matches = Match.objects.filter(tournament=tournament).only('pitch', 'home_team', 'away_team')
         
         # Generate groups (same logic as fixture generation)
         groups = generate_groups(teams, 'combinationB')
         
+        # Bucket matches by group once so each group is validated against its own matches only
+        grouped_matches = matches_by_group(all_matches)
+        
         # Validate each group
         all_valid = True
         group_validations = {}
@@ -1041,7 +1124,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
         for group in groups:
             group_name = group['name']
             group_teams = group['teams']
-            validation_result = validate_round_robin_completeness(group_teams, all_matches, group_name)
+            validation_result = validate_round_robin_completeness(group_teams, grouped_matches.get(group_name, []), group_name)
             group_validations[group_name] = validation_result
             if not validation_result.get('valid', False):
                 all_valid = False
@@ -1057,13 +1140,6 @@ class TournamentViewSet(viewsets.ModelViewSet):
         """Manually generate knockout stage from group qualifiers (organiser only)"""
         tournament = self.get_object()
         
-        # Check permission
-        if not request.user.is_authenticated or not request.user.is_staff:
-            return Response(
-                {'detail': 'Only organisers can generate knockouts'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         # Check if tournament format supports this
         if tournament.format != 'combination':
             return Response(
@@ -1080,12 +1156,9 @@ class TournamentViewSet(viewsets.ModelViewSet):
             )
         
         # Check if knockout stage already exists
-        from .models import Match
-        knockout_matches = Match.objects.filter(
-            tournament=tournament
-        ).exclude(pitch__icontains='Group')
+        has_knockout = Match.objects.filter(tournament=tournament).exclude(pitch__icontains='Group').exists()
         
-        if knockout_matches.exists():
+        if has_knockout:
             return Response({
                 'detail': 'Knockout stage already exists',
                 'already_generated': True,
@@ -1094,10 +1167,10 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         # Attempt to generate knockout stage
         try:
-            from .simulation_helpers import generate_knockout_stage_from_groups
             result = generate_knockout_stage_from_groups(tournament)
             
             if result:
+                cache.delete(awards_cache_key(tournament.id))
                 return Response({
                     'detail': 'Knockout stage generated successfully',
                     'generated': True,
@@ -1115,6 +1188,28 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['post'], url_path='sync-brackets', permission_classes=[IsAuthenticated, IsTournamentOrganiser])
+    def sync_brackets(self, request, pk=None):
+        """Build any knockout rounds the finished results call for but that are missing, e.g. after a failed background run"""
+        tournament = self.get_object()
+        
+        try:
+            generated, tournament_status = sync_tournament_brackets(tournament)
+        except Exception as e:
+            logger.exception("sync-brackets failed for tournament %s", tournament.id)
+            return Response(
+                {'detail': f'Error rebuilding brackets: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        cache.delete(awards_cache_key(tournament.id))
+        return Response({
+            'detail': 'Missing knockout rounds generated' if generated else 'Brackets already up to date',
+            'generated': generated,
+            'status': tournament_status,
+            'tournament_id': tournament.id
+        }, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['post'], url_path='referee-login', permission_classes=[AllowAny])
     def referee_login(self, request):
         """Referee login using username and passcode"""
@@ -1126,33 +1221,41 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 {'detail': 'Username and passcode are required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        try:
-            referee = Referee.objects.get(username=username, is_active=True)
-            if referee.passcode == passcode:  # Simple passcode check (can be hashed later)
-                # Return referee info and assigned matches
-                matches = Match.objects.filter(
-                    assigned_referees__referee=referee,
-                    status__in=['scheduled', 'live']
-                ).select_related('home_team', 'away_team', 'tournament').order_by('kickoff_at')
-                
-                from .serializers import MatchSerializer
-                return Response({
-                    'referee_id': referee.id,
-                    'name': referee.name,
-                    'username': referee.username,
-                    'assigned_matches': MatchSerializer(matches, many=True).data
-                })
-            else:
-                return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
-        except Referee.DoesNotExist:
+        # JSON bodies may carry the passcode as a number; both branches below must hash the same
+        # string, otherwise make_password rejects it and unknown usernames stand out with a 500
+        passcode = str(passcode)
+        
+        referee = Referee.objects.filter(username=username, is_active=True).first()
+        if referee is None:
+            # Run the hasher anyway so unknown usernames take as long as wrong passcodes
+            make_password(passcode)
+            return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+        if not referee.check_passcode(passcode):
             return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        # Return referee info and assigned matches
+        matches = Match.objects.filter(
+            assigned_referees__referee=referee,
+            status__in=['scheduled', 'live']
+        ).select_related(
+            'home_team__manager_user', 'away_team__manager_user', 'tournament__organizer', 'tournament__venue'
+        ).prefetch_related(
+            'home_team__memberships__player', 'away_team__memberships__player',
+            'scorers__player', 'scorers__assist__player', 'assists__player'
+        ).order_by('kickoff_at')
+        
+        return Response({
+            'referee_id': referee.id,
+            'name': referee.name,
+            'username': referee.username,
+            'assigned_matches': MatchSerializer(matches, many=True).data
+        })
 
     @action(detail=False, methods=['get'], url_path='by-slug/(?P<slug>[^/.]+)', permission_classes=[AllowAny])
     def by_slug(self, request, slug=None):
         """NEW: Get tournament by slug (public endpoint)"""
         try:
-            tournament = Tournament.objects.get(slug=slug)
+            tournament = self.get_queryset().get(slug=slug)
             serializer = self.get_serializer(tournament)
             return Response(serializer.data)
         except Tournament.DoesNotExist:
@@ -1191,13 +1294,12 @@ class TeamViewSet(viewsets.ModelViewSet):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     
+    # Public endpoints; create, update, delete and every other action require organiser
+    PUBLIC_ACTIONS = frozenset({'list', 'retrieve', 'by_slug'})
+    
     def get_permissions(self):
         """Apply different permissions based on action"""
-        if self.action in ['list', 'retrieve', 'by_slug']:
-            permission_classes = [AllowAny]
-        else:
-            # Create, update, delete require organiser
-            permission_classes = [IsAuthenticated, IsOrganiser]
+        permission_classes = _PUBLIC_PERMISSION_CLASSES if self.action in self.PUBLIC_ACTIONS else _ORGANISER_PERMISSION_CLASSES
         return [permission() for permission in permission_classes]
     
     def get_serializer_context(self):
@@ -1205,6 +1307,17 @@ class TeamViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
     
+    # Team names and badges appear in the awards payload of every tournament the team is in
+    def perform_update(self, serializer):
+        team = serializer.save()
+        _clear_team_awards_cache([team.id])
+    
+    def perform_destroy(self, instance):
+        # Registrations cascade with the team, so collect its tournaments before deleting
+        tournament_ids = list(instance.registrations.values_list('tournament_id', flat=True))
+        instance.delete()
+        cache.delete_many([awards_cache_key(tournament_id) for tournament_id in tournament_ids])
+    
     @action(detail=False, methods=['get'], url_path='by-slug/(?P<slug>[^/.]+)', permission_classes=[AllowAny])
     def by_slug(self, request, slug=None):
         """Get team by slug (public endpoint)"""
@@ -1224,16 +1337,15 @@ class RegistrationViewSet(mixins.CreateModelMixin,
                           mixins.UpdateModelMixin,
                           mixins.DestroyModelMixin,
                           viewsets.GenericViewSet):
-    queryset = Registration.objects.select_related("tournament","team").all()
+    queryset = Registration.objects.select_related("tournament__organizer","tournament__venue","team__manager_user").all()
     serializer_class = RegistrationSerializer
     
+    # Public endpoints; create, update, delete and every other action require organiser
+    PUBLIC_ACTIONS = frozenset({'list', 'retrieve', 'status'})
+    
     def get_permissions(self):
         """Apply different permissions based on action"""
-        if self.action in ['list', 'retrieve', 'status']:
-            permission_classes = [AllowAny]
-        else:
-            # Create, update, delete require organiser
-            permission_classes = [IsAuthenticated, IsOrganiser]
+        permission_classes = _PUBLIC_PERMISSION_CLASSES if self.action in self.PUBLIC_ACTIONS else _ORGANISER_PERMISSION_CLASSES
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
@@ -1241,10 +1353,23 @@ class RegistrationViewSet(mixins.CreateModelMixin,
         tid = self.request.query_params.get("tournament")
         return qs.filter(tournament_id=tid) if tid else qs
     
+    # Registrations decide which teams (and so which players) a tournament's awards consider
+    def perform_create(self, serializer):
+        registration = serializer.save()
+        cache.delete(awards_cache_key(registration.tournament_id))
+    
+    def perform_update(self, serializer):
+        previous_tournament_id = serializer.instance.tournament_id
+        registration = serializer.save()
+        cache.delete_many([awards_cache_key(previous_tournament_id), awards_cache_key(registration.tournament_id)])
+    
+    def perform_destroy(self, instance):
+        instance.delete()
+        cache.delete(awards_cache_key(instance.tournament_id))
+    
     @action(detail=True, methods=['get'], url_path='status')
     def status(self, request, pk=None):
         """Get registration status for polling (public endpoint)"""
-        from .guards import get_registration_status
         registration_id = int(pk)
         status_data = get_registration_status(request.user if request.user.is_authenticated else None, registration_id)
         return Response(status_data)
@@ -1255,7 +1380,7 @@ class RegistrationViewSet(mixins.CreateModelMixin,
         registration = self.get_object()
         
         # Check if user is organizer of this tournament
-        if not request.user.is_authenticated or registration.tournament.organizer_id != request.user.id:
+        if registration.tournament.organizer_id != request.user.id:
             return Response(
                 {'detail': 'Only the tournament organizer can mark registrations as paid'},
                 status=status.HTTP_403_FORBIDDEN
@@ -1264,12 +1389,14 @@ class RegistrationViewSet(mixins.CreateModelMixin,
         # Update status to paid
         registration.status = 'paid'
         registration.paid_amount = registration.tournament.entry_fee
-        registration.save()
+        Registration.objects.filter(pk=registration.pk).update(
+            status=registration.status, paid_amount=registration.paid_amount
+        )
+        cache.delete(awards_cache_key(registration.tournament_id))
         
-        # NEW: Send payment confirmation email to manager
+        # NEW: Send payment confirmation email to manager (queued so SMTP doesn't block the response)
         try:
-            from .emails import send_payment_confirmation
-            send_payment_confirmation(registration)
+            queue_payment_confirmation(registration)
         except Exception as e:
             # Don't fail the request if email fails
             logger.warning(f"Failed to send payment confirmation email: {e}")
@@ -1282,20 +1409,24 @@ class RegistrationViewSet(mixins.CreateModelMixin,
         })
 
 class MatchViewSet(viewsets.ModelViewSet):
-    queryset = Match.objects.select_related("tournament","home_team","away_team").prefetch_related("scorers__player", "scorers__assist__player", "assists__player").all()
+    queryset = Match.objects.select_related("tournament__organizer","tournament__venue","home_team__manager_user","away_team__manager_user").prefetch_related("scorers__player", "scorers__assist__player", "assists__player").all()
     serializer_class = MatchSerializer
     
+    # Public endpoints; create, update, delete and every other action require organiser
+    PUBLIC_ACTIONS = frozenset({'list', 'retrieve'})
+    
     def get_permissions(self):
         """Apply different permissions based on action"""
-        if self.action in ['list', 'retrieve']:
-            permission_classes = [AllowAny]
-        else:
-            # Create, update, delete require organiser
-            permission_classes = [IsAuthenticated, IsOrganiser]
+        permission_classes = _PUBLIC_PERMISSION_CLASSES if self.action in self.PUBLIC_ACTIONS else _ORGANISER_PERMISSION_CLASSES
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        if self.action in ('start_match', 'end_match'):
+            # Starting/ending reads only the match row and its tournament (organizer, rules, format);
+            # skip the joins and goal/assist prefetches the serializer-backed actions need
+            qs = Match.objects.select_related('tournament')
+        else:
+            qs = super().get_queryset()
         tid = self.request.query_params.get("tournament")
         team_id = self.request.query_params.get("team")
         
@@ -1306,12 +1437,24 @@ class MatchViewSet(viewsets.ModelViewSet):
             qs = qs.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
         
         return qs
+    
+    # Plain CRUD on a match changes results just as the custom actions do, so it drops cached awards too
+    def perform_create(self, serializer):
+        match = serializer.save()
+        cache.delete(awards_cache_key(match.tournament_id))
+    
+    def perform_update(self, serializer):
+        previous_tournament_id = serializer.instance.tournament_id
+        match = serializer.save()
+        cache.delete_many([awards_cache_key(previous_tournament_id), awards_cache_key(match.tournament_id)])
+    
+    def perform_destroy(self, instance):
+        instance.delete()
+        cache.delete(awards_cache_key(instance.tournament_id))
 
     @action(detail=True, methods=['post'], url_path='start', permission_classes=[IsMatchRefereeOrOrganizer])
     def start_match(self, request, pk=None):
         """Start match - set status to live and record start time"""
-        from django.utils import timezone
-        
         match = self.get_object()
         
         # Check if match is already started or finished
@@ -1328,17 +1471,18 @@ class MatchViewSet(viewsets.ModelViewSet):
         
         # Check permissions: organizer or assigned referee
         tournament = match.tournament
-        is_organizer = tournament.organizer_id == request.user.id if request.user.is_authenticated else False
+        is_organizer = tournament.organizer_id == request.user.id
         
         # Check if referee_id is provided (for referee login)
         referee_id = request.data.get('referee_id')
         is_referee = False
-        if referee_id:
+        if referee_id and not is_organizer:
             try:
-                from .models import Referee
-                referee = Referee.objects.get(id=referee_id, is_active=True)
-                is_referee = MatchReferee.objects.filter(match=match, referee=referee, is_primary=True).exists()
-            except:
+                # One join query: active referee assigned as primary for this match
+                is_referee = MatchReferee.objects.filter(
+                    match=match, referee_id=int(referee_id), referee__is_active=True, is_primary=True
+                ).exists()
+            except (ValueError, TypeError):
                 pass
         
         if not (is_organizer or is_referee):
@@ -1353,7 +1497,7 @@ class MatchViewSet(viewsets.ModelViewSet):
         # Get duration from tournament rules
         duration = tournament.rules.get('duration_mins', 20) if tournament.rules else 20
         match.duration_minutes = duration
-        match.save()
+        match.save(update_fields=['status', 'started_at', 'duration_minutes'])
         
         return Response({
             'detail': 'Match started',
@@ -1365,8 +1509,6 @@ class MatchViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], url_path='end', permission_classes=[IsMatchRefereeOrOrganizer])
     def end_match(self, request, pk=None):
         """End match - set status to finished"""
-        from .simulation_helpers import generate_next_knockout_round
-        
         match = self.get_object()
         
         # Check if match is already finished
@@ -1378,17 +1520,18 @@ class MatchViewSet(viewsets.ModelViewSet):
         
         # Check permissions: organizer or assigned referee
         tournament = match.tournament
-        is_organizer = tournament.organizer_id == request.user.id if request.user.is_authenticated else False
+        is_organizer = tournament.organizer_id == request.user.id
         
         # Check if referee_id is provided (for referee login)
         referee_id = request.data.get('referee_id')
         is_referee = False
-        if referee_id:
+        if referee_id and not is_organizer:
             try:
-                from .models import Referee
-                referee = Referee.objects.get(id=referee_id, is_active=True)
-                is_referee = MatchReferee.objects.filter(match=match, referee=referee, is_primary=True).exists()
-            except:
+                # One join query: active referee assigned as primary for this match
+                is_referee = MatchReferee.objects.filter(
+                    match=match, referee_id=int(referee_id), referee__is_active=True, is_primary=True
+                ).exists()
+            except (ValueError, TypeError):
                 pass
         
         if not (is_organizer or is_referee):
@@ -1397,19 +1540,26 @@ class MatchViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # End the match
-        match.status = 'finished'
-        match.save()
-        
-        # Auto-generate next knockout round if applicable
-        if (tournament.format == 'knockout' or 
-            (tournament.format == 'combination' and match.pitch and 'Group' not in match.pitch)):
-            if match.pitch:
-                try:
-                    generate_next_knockout_round(tournament, match.pitch)
-                except Exception as e:
-                    logger.debug(f"Error generating next knockout round: {str(e)}")
-                    # Don't fail if next round generation fails
+        with transaction.atomic():
+            # Lock the row and re-check: a concurrent end (double-click, two referees)
+            # that got the lock first leaves this one with nothing to do
+            locked_status = Match.objects.select_for_update().values_list('status', flat=True).get(pk=match.pk)
+            if locked_status == 'finished':
+                return Response(
+                    {'detail': 'Match is already finished'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # End the match
+            match.status = 'finished'
+            match.save(update_fields=['status'])
+            
+            # Auto-generate next knockout round if applicable (queued to run after commit)
+            if _is_knockout_match(match):
+                if match.pitch:
+                    # Built on a background worker so the referee's request returns immediately
+                    queue_next_knockout_round(tournament, match.pitch)
+        cache.delete(awards_cache_key(match.tournament_id))
         
         return Response({
             'detail': 'Match ended',
@@ -1418,36 +1568,27 @@ class MatchViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'], url_path='score', permission_classes=[IsAuthenticated, IsOrganiser])
     def set_score(self, request, pk=None):
-        from django.db import transaction
-        # MatchScorer and MatchAssist already imported at top of file
-        
         match = self.get_object()
-        try:
-            hs = int(request.data.get('home_score', 0))
-            as_ = int(request.data.get('away_score', 0))
-            # NEW: Penalty scores (for knockout matches)
-            home_penalties = request.data.get('home_penalties')
-            away_penalties = request.data.get('away_penalties')
-            if home_penalties is not None:
-                home_penalties = int(home_penalties)
-            if away_penalties is not None:
-                away_penalties = int(away_penalties)
-            # NEW: Support assists - arrays of player IDs (one per goal)
-            home_scorers = request.data.get('home_scorers', [])  # List of player IDs (one per goal)
-            away_scorers = request.data.get('away_scorers', [])  # List of player IDs (one per goal)
-            home_assists = request.data.get('home_assists', [])  # NEW: List of assister IDs or null (one per goal)
-            away_assists = request.data.get('away_assists', [])  # NEW: List of assister IDs or null (one per goal)
-        except (TypeError, ValueError):
-            return Response({'detail': 'Invalid score'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Check if this is a knockout match
-        is_knockout = False
-        if match.tournament.format == 'knockout':
-            is_knockout = True
-        elif match.tournament.format == 'combination':
-            # Check if pitch indicates knockout stage (not group stage)
-            if match.pitch and 'Group' not in match.pitch:
-                is_knockout = True
+        # Scores, penalties and player IDs are all coerced to int in one validation pass;
+        # every invalid field is reported together rather than stopping at the first
+        score_serializer = SetScoreSerializer(data=request.data)
+        if not score_serializer.is_valid():
+            return Response(
+                {'detail': 'Invalid score', 'errors': score_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        score_data = score_serializer.validated_data
+        hs = score_data['home_score']
+        as_ = score_data['away_score']
+        home_penalties = score_data['home_penalties']
+        away_penalties = score_data['away_penalties']
+        home_scorers = score_data['home_scorers']
+        away_scorers = score_data['away_scorers']
+        home_assists = score_data['home_assists']
+        away_assists = score_data['away_assists']
+        
+        # Check if this is a knockout match (reused for next-round generation below)
+        is_knockout = _is_knockout_match(match)
         
         # If knockout match ends in draw, require penalties
         if is_knockout and hs == as_:
@@ -1463,10 +1604,24 @@ class MatchViewSet(viewsets.ModelViewSet):
                     'requires_penalties': True
                 }, status=status.HTTP_400_BAD_REQUEST)
         
+        # Idempotency fast path: a re-submitted, identical result (auto-save, double-click)
+        # would delete and recreate the same rows and count player stats twice
+        if is_knockout and hs == as_:
+            penalties = (home_penalties, away_penalties)
+        else:
+            penalties = (None, None)
+        if _score_unchanged(match, max(0, hs), max(0, as_), penalties,
+                            home_scorers, home_assists, away_scorers, away_assists):
+            return Response(self.get_serializer(match).data)
+        
         with transaction.atomic():
             # Clear existing scorers and assists for this match
-            MatchAssist.objects.filter(match=match).delete()  # NEW: Delete assists first (due to FK)
-            MatchScorer.objects.filter(match=match).delete()
+            # Assists go first (FK to goal), so each table needs one plain DELETE with no
+            # collector SELECTs; neither model has delete signals to honour
+            assists = MatchAssist.objects.filter(match=match)
+            assists._raw_delete(assists.db)
+            scorers = MatchScorer.objects.filter(match=match)
+            scorers._raw_delete(scorers.db)
             
             # Update match score
             match.home_score = max(0, hs)
@@ -1481,129 +1636,64 @@ class MatchViewSet(viewsets.ModelViewSet):
                 match.away_penalties = None
             
             match.status = 'finished'
-            match.save()
+            match.save(update_fields=['home_score', 'away_score', 'home_penalties', 'away_penalties', 'status'])
             
             # Track player stats updates (to avoid double-counting)
-            player_goal_updates = {}
-            player_assist_updates = {}
+            player_goal_updates = Counter()
+            player_assist_updates = Counter()
             player_appearance_updates = set()
             
-            # NEW: Process home goals with assists
-            for idx, scorer_id in enumerate(home_scorers):
-                try:
-                    scorer_id = int(scorer_id)
-                    assister_id = home_assists[idx] if idx < len(home_assists) else None
-                    if assister_id is not None:
-                        try:
-                            assister_id = int(assister_id)
-                        except (ValueError, TypeError):
-                            assister_id = None
-                    
-                    scorer = Player.objects.get(id=scorer_id)
-                    # Verify scorer is on home team
-                    if TeamPlayer.objects.filter(team=match.home_team, player=scorer).exists():
-                        # Create goal record
-                        goal = MatchScorer.objects.create(
-                            match=match,
-                            player=scorer,
-                            team=match.home_team
-                        )
-                        
-                        # Track goal for stats update
-                        player_goal_updates[scorer_id] = player_goal_updates.get(scorer_id, 0) + 1
-                        player_appearance_updates.add(scorer_id)
-                        
-                        # NEW: Create assist record if assister specified
-                        if assister_id:
-                            try:
-                                assister = Player.objects.get(id=assister_id)
-                                # Verify assister is on same team
-                                if TeamPlayer.objects.filter(team=match.home_team, player=assister).exists():
-                                    MatchAssist.objects.create(
-                                        goal=goal,
-                                        match=match,
-                                        player=assister,
-                                        team=match.home_team
-                                    )
-                                    # Track assist for stats update
-                                    player_assist_updates[assister_id] = player_assist_updates.get(assister_id, 0) + 1
-                                    player_appearance_updates.add(assister_id)
-                            except Player.DoesNotExist:
-                                pass
-                except (ValueError, TypeError, Player.DoesNotExist):
-                    continue
+            # Resolve which referenced players belong to each side in one query,
+            # instead of a Player lookup and membership check per goal/assist
+            referenced_ids = {
+                player_id for player_id in [*home_scorers, *away_scorers, *home_assists, *away_assists]
+                if player_id is not None
+            }
+            team_members = {match.home_team_id: set(), match.away_team_id: set()}
+            memberships = TeamPlayer.objects.filter(
+                team_id__in=team_members, player_id__in=referenced_ids
+            ).values_list('team_id', 'player_id')
+            for team_id, player_id in memberships:
+                team_members[team_id].add(player_id)
+            home_member_ids = team_members[match.home_team_id]
+            away_member_ids = team_members[match.away_team_id]
+            goals_to_create = []
+            assists_to_create = []
             
-            # NEW: Process away goals with assists
-            for idx, scorer_id in enumerate(away_scorers):
-                try:
-                    scorer_id = int(scorer_id)
-                    assister_id = away_assists[idx] if idx < len(away_assists) else None
-                    if assister_id is not None:
-                        try:
-                            assister_id = int(assister_id)
-                        except (ValueError, TypeError):
-                            assister_id = None
-                    
-                    scorer = Player.objects.get(id=scorer_id)
-                    # Verify scorer is on away team
-                    if TeamPlayer.objects.filter(team=match.away_team, player=scorer).exists():
-                        # Create goal record
-                        goal = MatchScorer.objects.create(
-                            match=match,
-                            player=scorer,
-                            team=match.away_team
-                        )
-                        
-                        # Track goal for stats update
-                        player_goal_updates[scorer_id] = player_goal_updates.get(scorer_id, 0) + 1
-                        player_appearance_updates.add(scorer_id)
-                        
-                        # NEW: Create assist record if assister specified
-                        if assister_id:
-                            try:
-                                assister = Player.objects.get(id=assister_id)
-                                # Verify assister is on same team
-                                if TeamPlayer.objects.filter(team=match.away_team, player=assister).exists():
-                                    MatchAssist.objects.create(
-                                        goal=goal,
-                                        match=match,
-                                        player=assister,
-                                        team=match.away_team
-                                    )
-                                    # Track assist for stats update
-                                    player_assist_updates[assister_id] = player_assist_updates.get(assister_id, 0) + 1
-                                    player_appearance_updates.add(assister_id)
-                            except Player.DoesNotExist:
-                                pass
-                except (ValueError, TypeError, Player.DoesNotExist):
-                    continue
+            # NEW: Process home and away goals with assists
+            _queue_goals(match, match.home_team, home_scorers, home_assists, home_member_ids,
+                         goals_to_create, assists_to_create,
+                         player_goal_updates, player_assist_updates, player_appearance_updates)
+            _queue_goals(match, match.away_team, away_scorers, away_assists, away_member_ids,
+                         goals_to_create, assists_to_create,
+                         player_goal_updates, player_assist_updates, player_appearance_updates)
             
-            # Update player stats (goals, assists, appearances)
-            for player_id, goal_count in player_goal_updates.items():
-                try:
-                    player = Player.objects.get(id=player_id)
-                    player.goals = (player.goals or 0) + goal_count
-                    player.save()
-                except Player.DoesNotExist:
-                    continue
+            # Goals first so their primary keys are set before the assists that point at them
+            MatchScorer.objects.bulk_create(goals_to_create)
+            MatchAssist.objects.bulk_create(assists_to_create)
             
-            for player_id, assist_count in player_assist_updates.items():
-                try:
-                    player = Player.objects.get(id=player_id)
-                    player.assists = (player.assists or 0) + assist_count
-                    player.save()
-                except Player.DoesNotExist:
-                    continue
+            # Update player stats (goals, assists, appearances): one UPDATE per stat,
+            # incremented in the database so concurrent score updates can't lose counts
+            if player_goal_updates:
+                Player.objects.filter(id__in=player_goal_updates).update(
+                    goals=F('goals') + Case(
+                        *[When(id=player_id, then=Value(count)) for player_id, count in player_goal_updates.items()],
+                        output_field=IntegerField()
+                    )
+                )
+            
+            if player_assist_updates:
+                Player.objects.filter(id__in=player_assist_updates).update(
+                    assists=F('assists') + Case(
+                        *[When(id=player_id, then=Value(count)) for player_id, count in player_assist_updates.items()],
+                        output_field=IntegerField()
+                    )
+                )
             
             # Update appearances for all players who played (scorers and assisters already counted)
             # For other players, we'd need match lineups - for now, only update scorers/assisters
-            for player_id in player_appearance_updates:
-                try:
-                    player = Player.objects.get(id=player_id)
-                    player.appearances = (player.appearances or 0) + 1
-                    player.save()
-                except Player.DoesNotExist:
-                    continue
+            if player_appearance_updates:
+                Player.objects.filter(id__in=player_appearance_updates).update(appearances=F('appearances') + 1)
         
         # Store info for post-transaction next round generation
         should_generate_next_round = False
@@ -1623,112 +1713,40 @@ class MatchViewSet(viewsets.ModelViewSet):
                     should_check_group_qualifiers = True
             
             # Check if this is a knockout match that should generate next round
-            if (tournament_for_generation.format == 'knockout' or 
-                (tournament_for_generation.format == 'combination' and match.pitch and 'Group' not in match.pitch)):
+            if is_knockout:
                 if match.pitch:
                     should_generate_next_round = True
                     round_name_for_generation = match.pitch.strip()
         
+        # The scorers/assists prefetched by get_object() predate the rewrite above, so reload
+        # just those relations (two-level, no N+1) on the match we already have
+        match._prefetched_objects_cache = {}
+        prefetch_related_objects([match], 'scorers__player', 'scorers__assist__player', 'assists__player')
         response_data = self.get_serializer(match).data
         
-        # Auto-generate next knockout round if applicable (AFTER transaction commits)
-        # This ensures the match is fully saved and visible to queries
+        # Bracket generation runs on a background worker once the result commits, so the organiser's
+        # request returns without waiting for it. Whether the tournament is now complete depends on
+        # whether that generation adds matches, so the worker runs the completion check afterwards
         if should_generate_next_round:
-            try:
-                from .simulation_helpers import generate_next_knockout_round
-                # Refresh match from DB to ensure we have latest committed state
-                match.refresh_from_db()
-                
-                logger.debug(f"\n{'='*60}")
-                logger.debug(f"SET_SCORE: Attempting to generate next round after finishing match")
-                logger.debug(f"  Match ID: {match.id}")
-                logger.debug(f"  Tournament: {tournament_for_generation.name} (ID: {tournament_for_generation.id})")
-                logger.debug(f"  Tournament Format: {tournament_for_generation.format}")
-                logger.debug(f"  Match Pitch: '{match.pitch}'")
-                logger.debug(f"  Round Name for Generation: '{round_name_for_generation}'")
-                logger.debug(f"  Match Status (after refresh): {match.status}")
-                logger.debug(f"  Match Score: {match.home_score}-{match.away_score}")
-                logger.debug(f"  Match Penalties: {match.home_penalties}-{match.away_penalties}")
-                logger.debug(f"  Is Knockout: {is_knockout}")
-                logger.debug(f"{'='*60}\n")
-                
-                result = generate_next_knockout_round(tournament_for_generation, round_name_for_generation)
-                if result:
-                    logger.debug(f"\n{'='*60}")
-                    logger.debug(f"✓ SUCCESS: Generated next round after '{round_name_for_generation}'")
-                    logger.debug(f"  Match ID: {match.id}, Tournament: {tournament_for_generation.name}")
-                    logger.debug(f"{'='*60}\n")
-                else:
-                    logger.debug(f"\n{'='*60}")
-                    logger.debug(f"✗ FAILED: Next round generation returned False for '{round_name_for_generation}'")
-                    logger.debug(f"  Match ID: {match.id}, Tournament: {tournament_for_generation.name}")
-                    logger.debug(f"  Check the logs above for detailed reasons")
-                    # Check if Final already exists when generation fails for Semi-Finals
-                    if round_name_for_generation.lower() in ['semi-finals', 'semi finals', 'semifinals']:
-                        from .models import Match
-                        existing_final = Match.objects.filter(
-                            tournament=tournament_for_generation
-                        ).exclude(pitch__icontains='Group').filter(
-                            pitch__icontains='final'
-                        )
-                        logger.debug(f"  DEBUG: Checking if Final already exists...")
-                        logger.debug(f"  Found {existing_final.count()} match(es) with pitch containing 'final':")
-                        for m in existing_final:
-                            logger.debug(f"    Match {m.id}: pitch='{m.pitch}', status={m.status}")
-                    logger.debug(f"{'='*60}\n")
-            except Exception as e:
-                logger.exception(
-                    "Exception generating next knockout round after score update: %s",
-                    e,
-                )
-                # Don't fail if next round generation fails, but log the error
-        
-        # Auto-generate knockout stage from groups if qualifiers can be determined (AFTER transaction commits)
-        if should_check_group_qualifiers:
-            try:
-                from .simulation_helpers import can_determine_group_qualifiers, generate_knockout_stage_from_groups
-                match.refresh_from_db()
-                
-                logger.debug(f"\n{'='*60}")
-                logger.debug(f"SET_SCORE: Checking if group qualifiers can be determined")
-                logger.debug(f"  Match ID: {match.id}")
-                logger.debug(f"  Tournament: {tournament_for_generation.name} (ID: {tournament_for_generation.id})")
-                logger.debug(f"  Match Pitch: '{match.pitch}'")
-                logger.debug(f"{'='*60}\n")
-                
-                if can_determine_group_qualifiers(tournament_for_generation):
-                    logger.debug(f"All group matches finished. Auto-generating knockout stage...")
-                    knockout_generated = generate_knockout_stage_from_groups(tournament_for_generation)
-                    if knockout_generated:
-                        logger.debug(f"✓ SUCCESS: Knockout stage auto-generated")
-                        response_data['knockout_stage_generated'] = True
-                    else:
-                        logger.debug(f"Knockout stage generation returned False (may already exist)")
-                else:
-                    logger.debug(f"Group stage not yet complete. Cannot determine qualifiers yet.")
-            except Exception as e:
-                logger.exception(
-                    "Exception generating knockout stage after score update: %s",
-                    e,
-                )
-        
-        # Check if tournament should be marked as completed
-        if match.status == 'finished':
-            from .models import Match
-            all_matches = Match.objects.filter(tournament=match.tournament)
-            all_finished = all_matches.filter(status='finished').count()
-            total_matches = all_matches.count()
-            
-            # If all matches are finished, mark tournament as completed
-            if total_matches > 0 and all_finished == total_matches:
-                if match.tournament.status != 'completed':
-                    match.tournament.status = 'completed'
-                    match.tournament.save()
-                    logger.debug(f"\n{'='*60}")
-                    logger.debug(f"✓ Tournament '{match.tournament.name}' marked as COMPLETED")
-                    logger.debug(f"  All {total_matches} matches finished")
-                    logger.debug(f"{'='*60}\n")
-        
+            logger.debug(
+                "SET_SCORE: queueing next round after match %s (tournament %s): round=%r score=%s-%s penalties=%s-%s",
+                match.id, tournament_for_generation.id, round_name_for_generation,
+                match.home_score, match.away_score, match.home_penalties, match.away_penalties,
+            )
+            queue_next_knockout_round(tournament_for_generation, round_name_for_generation, check_completion=True)
+        elif should_check_group_qualifiers and can_determine_group_qualifiers(tournament_for_generation):
+            logger.debug(
+                "SET_SCORE: queueing knockout stage after match %s (tournament %s, pitch=%r)",
+                match.id, tournament_for_generation.id, match.pitch,
+            )
+            queue_knockout_stage_from_groups(tournament_for_generation)
+            # The stage is built after the response is sent; sync-brackets rebuilds it if that fails
+            response_data['knockout_stage_generated'] = 'queued'
+        elif match.status == 'finished':
+            # Nothing else can add matches, so check for completion here
+            mark_tournament_completed_if_finished(match.tournament)
+        
+        cache.delete(awards_cache_key(match.tournament_id))
         return Response(response_data)
 
 class PlayerViewSet(viewsets.ModelViewSet):
@@ -1736,9 +1754,20 @@ class PlayerViewSet(viewsets.ModelViewSet):
     serializer_class = PlayerSerializer
     # No auth required for now (we'll lock down later)
     permission_classes = [AllowAny]
+    
+    # Player names and photos appear in the awards of every tournament their teams are in
+    def perform_update(self, serializer):
+        player = serializer.save()
+        _clear_team_awards_cache(player.memberships.values_list('team_id', flat=True))
+    
+    def perform_destroy(self, instance):
+        # Memberships cascade with the player, so collect the teams before deleting
+        team_ids = list(instance.memberships.values_list('team_id', flat=True))
+        instance.delete()
+        _clear_team_awards_cache(team_ids)
 
 class TeamPlayerViewSet(viewsets.ModelViewSet):
-    queryset = TeamPlayer.objects.select_related('team','player').all()
+    queryset = TeamPlayer.objects.select_related('player').all()  # team is serialized as its PK only
     serializer_class = TeamPlayerSerializer
     permission_classes = [AllowAny]
 
@@ -1751,6 +1780,20 @@ class TeamPlayerViewSet(viewsets.ModelViewSet):
             except (ValueError, TypeError):
                 pass  # Invalid team_id, return all
         return qs
+    
+    # A roster change moves players in or out of the awards of the team's tournaments
+    def perform_create(self, serializer):
+        membership = serializer.save()
+        _clear_team_awards_cache([membership.team_id])
+    
+    def perform_update(self, serializer):
+        previous_team_id = serializer.instance.team_id
+        membership = serializer.save()
+        _clear_team_awards_cache([previous_team_id, membership.team_id])
+    
+    def perform_destroy(self, instance):
+        instance.delete()
+        _clear_team_awards_cache([instance.team_id])
 
 class UserView(APIView):
     """
@@ -1759,8 +1802,13 @@ class UserView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        serializer = UserWithRoleSerializer(request.user)
-        return Response(serializer.data)
+        # Served from cache on repeat hits; profile/user saves drop the entry
+        key = user_role_cache_key(request.user.id)
+        data = cache.get(key)
+        if data is None:
+            data = UserWithRoleSerializer(request.user).data
+            cache.set(key, data, USER_ROLE_CACHE_TIMEOUT)
+        return Response(data)
 
 class RegisterManagerView(APIView):
     """